@@ -1,7 +1,10 @@
-
 from django.apps import AppConfig
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        import api.db  # noqa: F401
+        import api.signals  # noqa: F401
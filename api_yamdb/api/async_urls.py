@@ -0,0 +1,6 @@
+from api.async_views import async_patterns
+from api.urls import urlpatterns as sync_urlpatterns
+
+READ_BASENAMES = ('categories', 'genres', 'titles', 'review', 'comment')
+
+urlpatterns = async_patterns(sync_urlpatterns, READ_BASENAMES)
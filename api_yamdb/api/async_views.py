@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.urls import URLPattern, URLResolver
+from rest_framework.permissions import SAFE_METHODS
+
+from api.db import check_connections, mark_connections_used
+from api.metrics import counting_queries
+from api.query_inspector import inspecting_queries
+
+read_executor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_READ_THREADS,
+    thread_name_prefix='async-read',
+)
+
+
+def as_async(view):
+    """Асинхронная обертка синхронного представления DRF.
+
+    Запросы на чтение выполняются в отдельном пуле потоков
+    (ASYNC_READ_THREADS) и не ждут друг друга, пока цикл событий
+    обслуживает медленных клиентов. Запросы на запись идут по обычному
+    синхронному пути Django (thread_sensitive). Ответ рендерится в
+    том же потоке, что и представление.
+    """
+
+    def run(request, *args, **kwargs):
+        close_old_connections()
+        check_connections()
+        try:
+            with counting_queries(), inspecting_queries():
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+            return response
+        finally:
+            close_old_connections()
+            mark_connections_used()
+
+    read = sync_to_async(run, thread_sensitive=False, executor=read_executor)
+    write = sync_to_async(run)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await read(request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+
+    return async_view
+
+
+def async_patterns(patterns, basenames):
+    """Копия маршрутов, где представления из basenames асинхронные."""
+    result = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            result.append(URLResolver(
+                pattern.pattern,
+                async_patterns(pattern.url_patterns, basenames),
+                pattern.default_kwargs,
+                pattern.app_name,
+                pattern.namespace,
+            ))
+        elif (pattern.name
+                and pattern.name.rsplit('-', 1)[0] in basenames):
+            result.append(URLPattern(
+                pattern.pattern,
+                as_async(pattern.callback),
+                pattern.default_args,
+                pattern.name,
+            ))
+        else:
+            result.append(pattern)
+    return result
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from api.cache import get_cache, get_generations, is_shared_cache
+
+PRINCIPAL_FIELDS = ('id', 'username', 'role', 'is_staff', 'is_active')
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация с кешированием пользователя.
+
+    Подключается в представлениях, которым достаточно минимального
+    набора полей пользователя (PRINCIPAL_FIELDS) для разрешений и
+    привязки автора. Ключ включает версию пользователя, которую
+    сигналы меняют при каждом сохранении или удалении User, поэтому
+    смена роли или блокировка действуют сразу во всех процессах.
+    Изменения мимо сигналов (QuerySet.update) видны не позже
+    AUTH_USER_CACHE_TIMEOUT. С локальным кешем процесса версия из
+    другого процесса не видна, и пользователь загружается из БД.
+    Остальные поля объекта из кеша отложены (deferred): при обращении
+    они загружаются из БД, а save() записывает только загруженные.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or not is_shared_cache():
+            return super().get_user(validated_token)
+        [version] = get_generations(f'user:{user_id}')
+        key = f'auth-user:{user_id}:{version}'
+        cache = get_cache()
+        principal = cache.get(key)
+        if principal is not None:
+            return self.make_user(principal)
+        user = super().get_user(validated_token)
+        cache.set(
+            key,
+            {field: getattr(user, field) for field in PRINCIPAL_FIELDS},
+            settings.AUTH_USER_CACHE_TIMEOUT
+        )
+        return user
+
+    def make_user(self, principal):
+        # from_db ожидает значения в порядке полей модели.
+        field_names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in principal
+        ]
+        return self.user_model.from_db(
+            DEFAULT_DB_ALIAS, field_names,
+            [principal[name] for name in field_names]
+        )
@@ -0,0 +1,169 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag, urlencode
+from rest_framework.response import Response
+
+CATALOGUE_GROUPS = ('categories', 'genres', 'titles')
+# Меняется при смене имени пользователя: имя автора есть в списках
+# отзывов и комментариев.
+USERNAMES_GROUP = 'usernames'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def is_shared_cache():
+    """Кеш общий для всех процессов приложения (API_CACHE_SHARED)."""
+    return settings.API_CACHE_SHARED
+
+
+def get_generations(*names):
+    """Время последнего изменения каждой из групп данных.
+
+    Если отметки в кеше нет, группа считается измененной сейчас.
+    """
+    cache = get_cache()
+    keys = {name: f'generation:{name}' for name in names}
+    generations = cache.get_many(keys.values())
+    missing = {
+        key: time.time() for key in keys.values() if key not in generations
+    }
+    for key, generation in missing.items():
+        cache.add(key, generation, None)
+    if missing:
+        generations.update(cache.get_many(missing.keys()))
+    return [generations.get(keys[name], time.time()) for name in names]
+
+
+def bump_generations(*names):
+    """Отмечает группы данных измененными, что сбрасывает их кеш."""
+    now = time.time()
+    get_cache().set_many(
+        {f'generation:{name}': now for name in names}, None
+    )
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def get_query_string(request):
+    return urlencode(sorted(request.query_params.lists()), doseq=True)
+
+
+class CachedResponseMixin:
+    """Кеширует данные ответов на чтение.
+
+    Ключ включает путь, параметры запроса и отметки изменения групп
+    cache_groups, поэтому запись устаревает сразу при изменении данных.
+    Ответ получает ETag и Last-Modified, на условный запрос с
+    совпадающим валидатором возвращается 304 без обращения к БД.
+    С локальным кешем процесса ответы не кешируются.
+    """
+    cache_groups = ()
+
+    def get_cache_key(self, request, generations):
+        raw_key = f'{request.path}?{get_query_string(request)}:{generations}'
+        return f'api-response:{hashlib.md5(raw_key.encode()).hexdigest()}'
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if not is_shared_cache():
+            return handler(request, *args, **kwargs)
+        generations = get_generations(*self.cache_groups)
+        key = self.get_cache_key(request, generations)
+        etag = quote_etag(key.split(':')[1])
+        last_modified = int(max(generations))
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return set_validators(not_modified, etag, last_modified)
+        cache = get_cache()
+        data = cache.get(key)
+        if data is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        else:
+            response = Response(data)
+        return set_validators(response, etag, last_modified)
+
+
+class CachedListMixin(CachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalListMixin:
+    """Отвечает 304 на повторный запрос списка без изменений.
+
+    Валидатор строится без сериализации: из отметок изменения группы
+    get_generation_name() и имен пользователей и одного агрегата по
+    get_validator_queryset() (число записей, максимальные id и
+    pub_date). С локальным кешем
+    процесса отметки изменений из других процессов не видны, и ответ
+    всегда отдается целиком.
+    """
+
+    def get_generation_name(self):
+        """Группа get_generations записей списка или None."""
+        return None
+
+    def get_validator_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_list_validators(self, request):
+        names = [
+            name for name in (self.get_generation_name(), USERNAMES_GROUP)
+            if name
+        ]
+        generations = get_generations(*names)
+        generation = max(generations)
+        state = self.get_validator_queryset().aggregate(
+            count=Count('pk'), last_id=Max('pk'), last_pub_date=Max('pub_date')
+        )
+        raw_etag = (
+            f'{request.path}?{get_query_string(request)}:{generations}:'
+            f'{state["count"]}:{state["last_id"]}:{state["last_pub_date"]}'
+        )
+        last_modified = generation
+        if state['last_pub_date'] is not None:
+            last_modified = max(
+                generation, state['last_pub_date'].timestamp()
+            )
+        return (
+            quote_etag(hashlib.md5(raw_etag.encode()).hexdigest()),
+            int(last_modified)
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not is_shared_cache():
+            return super().list(request, *args, **kwargs)
+        etag, last_modified = self.get_list_validators(request)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return set_validators(not_modified, etag, last_modified)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        return set_validators(response, etag, last_modified)
@@ -0,0 +1,44 @@
+"""Формат CSV-файлов данных (static/data).
+
+Общий для загрузки (load_data_db), выгрузки (export_data_db) и
+эндпойнта /api/v1/export/.
+"""
+from reviews.models import (
+    Category, Comment, Genre, GenreTitle, Review, Title, User)
+
+FILE_NAMES_MODELS = {
+    'category.csv': Category,
+    'genre.csv': Genre,
+    'users.csv': User,
+    'titles.csv': Title,
+    'genre_title.csv': GenreTitle,
+    'review.csv': Review,
+    'comments.csv': Comment,
+}
+# Колонка CSV -> (attname внешнего ключа, связанная модель).
+FK_COLUMNS = {
+    Title: {'category': ('category_id', Category)},
+    GenreTitle: {
+        'title_id': ('title_id_id', Title),
+        'genre_id': ('genre_id_id', Genre),
+    },
+    Review: {
+        'title_id': ('title_id', Title),
+        'author': ('author_id', User),
+    },
+    Comment: {
+        'review_id': ('review_id', Review),
+        'author': ('author_id', User),
+    },
+}
+
+
+def get_column_field(model, column):
+    """Поле модели, в которое записывается колонка CSV."""
+    if column in FK_COLUMNS.get(model, {}):
+        attname, _ = FK_COLUMNS[model][column]
+        return next(
+            field for field in model._meta.concrete_fields
+            if field.attname == attname
+        )
+    return model._meta.get_field(column)
@@ -0,0 +1,102 @@
+"""Управление соединениями с БД: проверка и реплики для чтения."""
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.dispatch import receiver
+from rest_framework.permissions import SAFE_METHODS
+
+from api.middleware import AsyncCapableMiddleware
+
+use_replicas = ContextVar('use_replicas', default=False)
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    """Закрывает постоянные соединения, которые перестали отвечать.
+
+    Django сам проверяет соединение только после ошибки, поэтому
+    соединение, оборванное сервером между запросами (CONN_MAX_AGE),
+    иначе уронило бы первый запрос после обрыва. Проверка стоит одного
+    SELECT 1, поэтому проверяются только соединения, которые простояли
+    без дела дольше DB_HEALTH_CHECK_INTERVAL секунд.
+    """
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        last_used = getattr(connection, 'health_last_used', None)
+        if (last_used is not None and now - last_used
+                < settings.DB_HEALTH_CHECK_INTERVAL):
+            continue
+        if not connection.is_usable():
+            connection.close()
+
+
+@receiver(request_finished)
+def mark_connections_used(**kwargs):
+    """Запоминает, когда открытые соединения потока работали последний раз."""
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.health_last_used = now
+
+
+class ReplicaRouter:
+    """Отправляет чтение в реплики DATABASE_REPLICAS.
+
+    Реплики используются только внутри запросов на чтение к
+    представлениям DRF (см. ReplicaReadMiddleware), запись и все
+    остальное идут в default.
+    """
+
+    def get_replicas(self, model):
+        return settings.DATABASE_REPLICAS
+
+    def db_for_read(self, model, **hints):
+        replicas = self.get_replicas(model)
+        if replicas and use_replicas.get():
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaReadMiddleware(AsyncCapableMiddleware):
+    """Разрешает чтение из реплик в GET/HEAD/OPTIONS запросах к API."""
+
+    def handle(self, request):
+        token = use_replicas.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replicas.reset(token)
+        return self.process_response(request, response)
+
+    async def ahandle(self, request):
+        token = use_replicas.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            use_replicas.reset(token)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (request.method in SAFE_METHODS
+                and getattr(view_func, 'cls', None) is not None):
+            use_replicas.set(True)
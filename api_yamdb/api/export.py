@@ -0,0 +1,62 @@
+import csv
+import io
+import zlib
+
+from api.csv_schema import FILE_NAMES_MODELS, get_column_field
+
+# Колонки выгрузки в формате файлов load_data_db.
+EXPORT_COLUMNS = {
+    'category.csv': ('id', 'name', 'slug'),
+    'genre.csv': ('id', 'name', 'slug'),
+    'users.csv': (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    ),
+    'titles.csv': ('id', 'name', 'year', 'category', 'description'),
+    'genre_title.csv': ('id', 'title_id', 'genre_id'),
+    'review.csv': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments.csv': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def format_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(file_name, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Файл выгрузки частями по chunk_size строк.
+
+    Записи читаются QuerySet.iterator(), который на PostgreSQL
+    использует серверный курсор, поэтому память не зависит от размера
+    таблицы.
+    """
+    model = FILE_NAMES_MODELS[file_name]
+    columns = EXPORT_COLUMNS[file_name]
+    attnames = [get_column_field(model, column).attname for column in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    rows = model.objects.order_by('pk').values_list(*attnames).iterator(
+        chunk_size=chunk_size
+    )
+    for index, row in enumerate(rows, 1):
+        writer.writerow([format_value(value) for value in row])
+        if index % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def gzip_stream(chunks):
+    """Сжимает поток строк в gzip на лету."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,70 @@
+from django.db.models import Count, F
+
+from reviews.models import Category, Genre, Title
+
+
+def get_facet_counts():
+    """Счетчики по всему каталогу из title_count: два запроса."""
+    return {
+        'genre': list(
+            Genre.objects.filter(title_count__gt=0).order_by('name').values(
+                'slug', 'name', count=F('title_count')
+            )
+        ),
+        'category': list(
+            Category.objects.filter(title_count__gt=0).order_by(
+                'name'
+            ).values('slug', 'name', count=F('title_count'))
+        ),
+    }
+
+
+def get_filtered_facet_counts(title_ids):
+    """Счетчики по отфильтрованным произведениям.
+
+    title_ids — подзапрос с id произведений; на каждое измерение
+    один сгруппированный запрос.
+    """
+    return {
+        model.__name__.lower(): list(
+            model.objects.filter(titles__in=title_ids).annotate(
+                count=Count('titles')
+            ).order_by('name').values('slug', 'name', 'count')
+        )
+        for model in (Genre, Category)
+    }
+
+
+class FacetListMixin:
+    """Добавляет в ответ списка счетчики по жанрам и категориям.
+
+    Включается параметром ?facets=1. Без фильтров счетчики читаются из
+    поддерживаемых сигналами полей title_count, с фильтрами считаются
+    сгруппированными запросами по отфильтрованному набору.
+    """
+    facets_query_param = 'facets'
+
+    def has_active_filters(self, request):
+        return any(
+            request.query_params.get(name)
+            for name in self.filterset_class.base_filters
+        )
+
+    def get_facets(self, request):
+        if not self.has_active_filters(request):
+            return get_facet_counts()
+        filterset = self.filterset_class(
+            request.query_params,
+            queryset=Title.objects.order_by(),
+            request=request,
+        )
+        return get_filtered_facet_counts(
+            filterset.qs.order_by().values('pk')
+        )
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if (request.query_params.get(self.facets_query_param)
+                and isinstance(response.data, dict)):
+            response.data['facets'] = self.get_facets(request)
+        return response
@@ -1,5 +1,7 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
 from reviews.models import Title
+from reviews.search import search
 
 
 class TitleFilterSet(filters.FilterSet):
@@ -7,7 +9,21 @@ class TitleFilterSet(filters.FilterSet):
     genre = filters.CharFilter(field_name='genre__slug')
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
     year = filters.NumberFilter(field_name='year')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ['category', 'genre', 'name', 'year']
+        fields = ['category', 'genre', 'name', 'year', 'search']
+
+    def filter_search(self, queryset, name, value):
+        return search(queryset, value)
+
+
+class SearchRankOrderingFilter(OrderingFilter):
+    """Без явного ordering результаты поиска идут по релевантности."""
+    search_param = 'search'
+
+    def get_default_ordering(self, view):
+        if view.request.query_params.get(self.search_param):
+            return ('-search_rank', 'id')
+        return super().get_default_ordering(view)
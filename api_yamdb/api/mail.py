@@ -0,0 +1,148 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(recipient, subject, body):
+    """Кладет письмо в очередь; отправка начнется после коммита."""
+    email = OutgoingEmail.objects.create(
+        recipient=recipient, subject=subject, body=body
+    )
+    if settings.EMAIL_OUTBOX_WORKER:
+        transaction.on_commit(wake_worker)
+    return email
+
+
+def get_backoff(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def claim_pending(limit):
+    """Забирает пачку готовых к отправке писем.
+
+    Строки блокируются с SKIP LOCKED, а send_after сдвигается на
+    EMAIL_CLAIM_TIMEOUT, поэтому несколько воркеров не берут одни и те
+    же письма, а SMTP-сессия идет вне транзакции. Письмо, чей воркер
+    упал, снова станет доступным по истечении этого срока.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                sent_at__isnull=True,
+                send_after__lte=now,
+                attempts__lt=settings.EMAIL_MAX_ATTEMPTS,
+            )[:limit]
+        )
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(
+            send_after=now + timedelta(seconds=settings.EMAIL_CLAIM_TIMEOUT)
+        )
+    return emails
+
+
+def send_pending(limit=None):
+    """Отправляет одну пачку писем через одно SMTP-соединение.
+
+    Возвращает количество взятых в работу писем.
+    """
+    emails = claim_pending(limit or settings.EMAIL_BATCH_SIZE)
+    if not emails:
+        return 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            mark_failed(email, error)
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'send_after', 'last_error')
+        )
+        return len(emails)
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[email.recipient],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                mark_failed(email, error)
+            else:
+                email.sent_at = timezone.now()
+                email.last_error = ''
+    finally:
+        connection.close()
+    OutgoingEmail.objects.bulk_update(
+        emails, ('sent_at', 'attempts', 'send_after', 'last_error')
+    )
+    return len(emails)
+
+
+def mark_failed(email, error):
+    logger.warning('Не удалось отправить письмо %s: %s', email.pk, error)
+    email.attempts += 1
+    email.send_after = timezone.now() + get_backoff(email.attempts)
+    email.last_error = str(error)
+
+
+def drain(limit=None):
+    """Отправляет письма, пока в очереди есть готовые к отправке."""
+    total = 0
+    while True:
+        claimed = send_pending(limit)
+        if not claimed:
+            return total
+        total += claimed
+
+
+class OutboxWorker(threading.Thread):
+    """Фоновый поток, отправляющий письма из очереди.
+
+    Просыпается по сигналу после коммита нового письма и раз в
+    EMAIL_POLL_INTERVAL, чтобы подобрать повторные попытки.
+    """
+
+    def __init__(self):
+        super().__init__(name='outbox-worker', daemon=True)
+        self.wakeup = threading.Event()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(settings.EMAIL_POLL_INTERVAL)
+            self.wakeup.clear()
+            try:
+                drain()
+            except Exception:
+                logger.exception('Ошибка отправки очереди писем')
+            finally:
+                close_old_connections()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def wake_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = OutboxWorker()
+            _worker.start()
+    _worker.wakeup.set()
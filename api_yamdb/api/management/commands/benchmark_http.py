@@ -0,0 +1,96 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from statistics import mean, quantiles
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand
+
+
+def fetch(url, headers, timeout, data=None):
+    start = time.perf_counter()
+    try:
+        with urlopen(
+                Request(url, data=data, headers=headers), timeout=timeout
+        ) as resp:
+            resp.read()
+            status = resp.status
+    except HTTPError as error:
+        status = error.code
+    except (URLError, OSError):
+        status = None
+    return status, time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест HTTP-эндпойнтов: запускается против WSGI- и '
+        'ASGI-серверов, чтобы сравнить пропускную способность и задержки'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help='Адреса для запросов')
+        parser.add_argument(
+            '--requests', type=int, default=1000,
+            help='Количество запросов на каждый адрес',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=50,
+            help='Количество одновременных запросов',
+        )
+        parser.add_argument(
+            '--header', action='append', default=[],
+            help='Заголовок запроса в виде "Имя: значение"',
+        )
+        parser.add_argument(
+            '--data',
+            help='Тело POST-запроса в JSON; {n} заменяется номером запроса',
+        )
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        headers = dict(
+            (part.strip() for part in header.split(':', 1))
+            for header in options['header']
+        )
+        if options['data'] is not None:
+            headers.setdefault('Content-Type', 'application/json')
+
+        def body(number):
+            if options['data'] is None:
+                return None
+            return options['data'].replace('{n}', str(number)).encode()
+
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            for url in options['urls']:
+                start = time.perf_counter()
+                results = list(executor.map(
+                    lambda number: fetch(
+                        url, headers, options['timeout'], body(number)
+                    ),
+                    range(options['requests']),
+                ))
+                self.report(url, results, time.perf_counter() - start)
+
+    def report(self, url, results, elapsed):
+        timings = [timing * 1000 for _, timing in results]
+        errors = sum(
+            1 for status, _ in results if status is None or status >= 500
+        )
+        p50, p95, p99 = (
+            quantiles(timings, n=100)[index] for index in (49, 94, 98)
+        ) if len(timings) > 1 else (timings[0],) * 3
+        statuses = ', '.join(
+            f'{status}: {count}' for status, count in sorted(
+                Counter(status for status, _ in results).items(), key=str
+            )
+        )
+        self.stdout.write(
+            f'{url}\n'
+            f'  запросов: {len(results)}, ошибок: {errors}, '
+            f'RPS: {len(results) / elapsed:.1f}\n'
+            f'  задержка, мс: среднее {mean(timings):.1f}, '
+            f'p50 {p50:.1f}, p95 {p95:.1f}, p99 {p99:.1f}\n'
+            f'  ответы: {statuses}'
+        )
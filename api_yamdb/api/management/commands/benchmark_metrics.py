@@ -0,0 +1,79 @@
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.urls import resolve
+
+from api.metrics import MetricsMiddleware, registry
+
+DEFAULT_PATHS = (
+    '/api/v1/titles/', '/api/v1/categories/', '/api/v1/genres/',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет накладные расходы MetricsMiddleware: одни и те же '
+        'запросы выполняются в процессе с метриками и без них'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='*', default=DEFAULT_PATHS,
+            help='Адреса для GET-запросов',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help='Количество запросов на адрес в каждом раунде',
+        )
+        parser.add_argument(
+            '--rounds', type=int, default=5,
+            help='Количество чередующихся раундов',
+        )
+
+    def run_round(self, paths, requests, enabled):
+        with override_settings(API_METRICS_ENABLED=enabled):
+            client = Client()
+            start = time.perf_counter()
+            for path in paths:
+                for _ in range(requests):
+                    client.get(path)
+            elapsed = time.perf_counter() - start
+        return elapsed / (len(paths) * requests)
+
+    def measure_middleware(self, path, requests):
+        """Собственная стоимость MetricsMiddleware без представления."""
+        request = RequestFactory().get(path)
+        request.resolver_match = resolve(path)
+        response = HttpResponse()
+        with override_settings(API_METRICS_ENABLED=True):
+            middleware = MetricsMiddleware(lambda request: response)
+        start = time.perf_counter()
+        for _ in range(requests):
+            middleware(request)
+        return (time.perf_counter() - start) / requests
+
+    def handle(self, *args, **options):
+        paths, requests = options['paths'], options['requests']
+        # Прогрев: кеш ответов, соединение с БД, импорты.
+        self.run_round(paths, 10, True)
+        timings = {True: [], False: []}
+        for _ in range(options['rounds']):
+            for enabled in (False, True):
+                timings[enabled].append(
+                    self.run_round(paths, requests, enabled)
+                )
+        own = self.measure_middleware(paths[0], requests * 10) * 1e6
+        registry.clear()
+        without, with_metrics = (
+            median(timings[enabled]) * 1e6 for enabled in (False, True)
+        )
+        self.stdout.write(
+            f'Запрос без метрик: {without:.1f} мкс, '
+            f'с метриками: {with_metrics:.1f} мкс\n'
+            f'Накладные расходы: {with_metrics - without:.1f} мкс '
+            f'({(with_metrics - without) / without:.1%})\n'
+            f'Собственная стоимость MetricsMiddleware: {own:.1f} мкс'
+        )
@@ -0,0 +1,127 @@
+import random
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.aggregates import rebuild_ratings
+from reviews.models import Review, Title, User
+from reviews.search import search
+
+SYLLABLES = (
+    'ка', 'ро', 'ми', 'ту', 'ле', 'на', 'сю', 'жет', 'гер', 'ой', 'фи',
+    'льм', 'ак', 'тер', 'ско', 'ук', 'ра', 'зв', 'яз', 'ка', 'мо', 'ре',
+)
+AUTHORS = 1000
+BATCH_SIZE = 5000
+
+
+def make_vocabulary(size, rng):
+    return [
+        ''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+        for _ in range(size)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает полнотекстовый поиск по отзывам с поиском через LIKE; '
+        'с --populate сначала создает синтетические отзывы'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--populate', type=int, default=0, metavar='N',
+            help='Создать N синтетических отзывов (например, 1000000)',
+        )
+        parser.add_argument(
+            '--query', action='append', default=[],
+            help='Поисковый запрос, можно указать несколько раз',
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        vocabulary = make_vocabulary(2000, rng)
+        if options['populate']:
+            self.populate(options['populate'], vocabulary, rng)
+        queries = options['query'] or rng.sample(vocabulary, 3)
+        self.stdout.write(f'Отзывов в БД: {Review.objects.count()}')
+        for query in queries:
+            fts = self.measure(
+                lambda: list(
+                    search(Review.objects.all(), query)
+                    .order_by('-search_rank')[:10]
+                ),
+                options['repeat'],
+            )
+            like = self.measure(
+                lambda: list(
+                    Review.objects.filter(text__icontains=query)[:10]
+                ),
+                options['repeat'],
+            )
+            self.stdout.write(
+                f'"{query}": полнотекстовый {fts:.1f} мс, LIKE {like:.1f} мс'
+            )
+
+    def measure(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return median(timings)
+
+    def populate(self, count, vocabulary, rng):
+        """Создает count отзывов: по AUTHORS на каждое произведение."""
+        started = time.monotonic()
+        authors = [
+            User(username=f'bench_{index}', email=f'bench_{index}@yamdb.fake')
+            for index in range(AUTHORS)
+        ]
+        User.objects.bulk_create(authors, ignore_conflicts=True)
+        author_ids = list(
+            User.objects.filter(username__startswith='bench_')
+            .values_list('pk', flat=True)[:AUTHORS]
+        )
+        title_count = -(-count // len(author_ids))
+        first_title = Title.objects.count()
+        Title.objects.bulk_create(
+            Title(
+                name=f'Бенчмарк {first_title + index}', year=2000,
+                description=' '.join(rng.choices(vocabulary, k=30)),
+            )
+            for index in range(title_count)
+        )
+        title_ids = list(
+            Title.objects.order_by('-pk').values_list('pk', flat=True)[
+                :title_count
+            ]
+        )
+        batch, created = [], 0
+        for title_id in title_ids:
+            for author_id in author_ids:
+                if created + len(batch) >= count:
+                    break
+                batch.append(Review(
+                    title_id=title_id, author_id=author_id,
+                    text=' '.join(rng.choices(vocabulary, k=40)),
+                    score=rng.randint(1, 10),
+                ))
+                if len(batch) == BATCH_SIZE:
+                    created += self.flush(batch)
+                    batch = []
+        created += self.flush(batch)
+        rebuild_ratings(title_ids)
+        self.stdout.write(
+            f'Создано отзывов: {created} за '
+            f'{time.monotonic() - started:.0f} с'
+        )
+
+    def flush(self, batch):
+        with transaction.atomic():
+            Review.objects.bulk_create(batch, ignore_conflicts=True)
+        return len(batch)
@@ -0,0 +1,50 @@
+import gzip
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.export import DEFAULT_CHUNK_SIZE, EXPORT_COLUMNS, iter_csv
+
+
+class Command(BaseCommand):
+    help = 'Выгружает данные из БД в CSV в формате load_data_db'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            required=True,
+            help=(
+                'Каталог для файлов выгрузки; не static/data, чтобы не '
+                'перезаписать файлы для load_data_db'
+            ),
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы (имя.csv.gz)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Сколько строк читать из БД за раз',
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(options['path'], exist_ok=True)
+        for file_name in EXPORT_COLUMNS:
+            path = os.path.join(options['path'], file_name)
+            if options['gzip']:
+                path += '.gz'
+                opener = gzip.open
+            else:
+                opener = open
+            started = time.monotonic()
+            with opener(path, 'wt', encoding='utf-8', newline='') as f:
+                for chunk in iter_csv(file_name, options['chunk_size']):
+                    f.write(chunk)
+            self.stdout.write(
+                f'{os.path.basename(path)}: выгружен за '
+                f'{time.monotonic() - started:.2f} с'
+            )
@@ -1,23 +1,37 @@
 import csv
+import json
+import multiprocessing
 import os
+import shutil
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from functools import partial
 
-from django.core.management.base import BaseCommand
+import django
 
+from django.core.exceptions import ValidationError
+from django.core.management.base import (
+    BaseCommand, CommandError, OutputWrapper)
+from django.core.management.color import no_style
+from django.db import (
+    DatabaseError, IntegrityError, connection, connections, transaction)
+from django.db.models import CharField, TextField, UniqueConstraint
+from django.utils import timezone
+
+from api.cache import CATALOGUE_GROUPS, bump_generations
+from api.csv_schema import FILE_NAMES_MODELS, FK_COLUMNS, get_column_field
+from reviews.aggregates import rebuild_facets, rebuild_ratings
 from reviews.models import (
     Category, Comment, Genre, GenreTitle, Review, Title, User)
 
-FILE_NAMES_MODELS = {
-    'category.csv': Category,
-    'genre.csv': Genre,
-    'users.csv': User,
-    'titles.csv': Title,
-    'genre_title.csv': GenreTitle,
-    'review.csv': Review,
-    'comments.csv': Comment,
-}
 HOME_DIR = os.getcwd()
 FILES_DIR = os.path.join(HOME_DIR, 'static', 'data')
+DEFAULT_BATCH_SIZE = 1000
+# Файлы, которые при --workers > 1 делятся на части по числу процессов.
+SPLIT_FILES = ('genre_title.csv', 'review.csv', 'comments.csv')
+CHECKPOINTS_DIR = os.path.join(FILES_DIR, '.checkpoints')
 
 
 def lost_files(files, path):
@@ -78,15 +92,676 @@ def load_row_to_bd(row, model):
         create_obj(row, model)
 
 
+def reset_sequences(models):
+    """Сдвигает счетчики id после вставки записей с явными id."""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def split_csv(path, chunk_count):
+    """Делит файл на части примерно равного размера в байтах.
+
+    Возвращает диапазоны байт (начало, конец) без заголовка. Границы
+    ищутся по записям CSV, а не по переводам строки: текст в кавычках
+    может занимать несколько строк. Файл читается один раз, процессы
+    пула разбирают только свои диапазоны.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        position = 0
+
+        def lines():
+            nonlocal position
+            for line in f:
+                position += len(line)
+                yield line.decode('utf-8')
+
+        reader = csv.reader(lines())
+        next(reader, None)
+        bounds = [position]
+        for _ in reader:
+            if len(bounds) < chunk_count and position >= (
+                    bounds[0] + (size - bounds[0]) * len(bounds)
+                    // chunk_count):
+                bounds.append(position)
+    if bounds[-1] < position:
+        bounds.append(position)
+    return list(zip(bounds, bounds[1:]))
+
+
+def read_range(path, start, end):
+    """Строки файла из диапазона байт, найденного split_csv."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        position = start
+        for line in f:
+            if position >= end:
+                break
+            position += len(line)
+            yield line.decode('utf-8')
+
+
+class RowError(Exception):
+    """Строка CSV не может быть записана в БД."""
+
+
+def get_byte_ranges(path, chunk_count, checkpoints=None):
+    """Части файла для загрузки, None - файл целиком.
+
+    С --resume разбиение сохраняется вместе с прогрессом и повторяется
+    при продолжении с другим числом процессов: прогресс привязан к
+    частям, и новое разбиение начало бы загрузку заново.
+    """
+    file_name = os.path.basename(path)
+    if checkpoints:
+        layout = checkpoints.get_layout(file_name)
+        if layout is not None:
+            return layout
+        progress = checkpoints.get(file_name)
+        if progress['rows'] or progress['done']:
+            return [None]
+    byte_ranges = [None]
+    if chunk_count > 1:
+        byte_ranges = split_csv(path, chunk_count) or [None]
+    if checkpoints and len(byte_ranges) > 1:
+        checkpoints.save_layout(file_name, byte_ranges)
+    return byte_ranges
+
+
+def load_part(loader, path, model, chunk, chunk_count, byte_range):
+    if byte_range is None:
+        return loader.load_file(path, model)
+    return loader.load_file(path, model, chunk, chunk_count, byte_range)
+
+
+def insert_objects(model, objs):
+    """bulk_create, который записывает даты из CSV как есть.
+
+    bulk_create подставляет текущее время в поля auto_now_add; вставка
+    с raw, как в loaddata, берет значения из объектов.
+    """
+    fields = model._meta.concrete_fields
+    batch_size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+    for start in range(0, len(objs), batch_size):
+        model._base_manager._insert(
+            objs[start:start + batch_size], fields=fields, raw=True
+        )
+
+
+class Checkpoints:
+    """Прогресс загрузки: по JSON-файлу на файл CSV или его часть.
+
+    Отдельные файлы позволяют процессам пула писать прогресс
+    без блокировок.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def get_key(file_name, chunk=0, chunk_count=1):
+        if chunk_count == 1:
+            return file_name
+        return f'{file_name}.{chunk}-{chunk_count}'
+
+    def get(self, key):
+        try:
+            with open(os.path.join(self.path, f'{key}.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'rows': 0, 'done': False}
+
+    def save(self, key, rows, done=False):
+        self.write(key, {'rows': rows, 'done': done})
+
+    def get_layout(self, file_name):
+        """Разбиение файла на части из split_csv или None."""
+        try:
+            path = os.path.join(self.path, f'{file_name}.layout.json')
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save_layout(self, file_name, byte_ranges):
+        self.write(f'{file_name}.layout', byte_ranges)
+
+    def write(self, key, data):
+        path = os.path.join(self.path, f'{key}.json')
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(f'{path}.tmp', path)
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class BulkLoader:
+    """Пакетная загрузка CSV через bulk_create.
+
+    Внешние ключи проверяются по множествам id в памяти и присваиваются
+    напрямую через attname, без запроса на каждую строку.
+    С upsert существующие по id записи обновляются, если изменились.
+    С checkpoints каждая пачка фиксируется отдельно, а номер последней
+    записанной строки сохраняется для продолжения загрузки.
+    """
+
+    def __init__(self, batch_size, stdout, stderr,
+                 upsert=False, checkpoints=None):
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.stderr = stderr
+        self.upsert = upsert
+        self.checkpoints = checkpoints
+        self.failed = False
+        self.known_ids = {}
+
+    def get_known_ids(self, model):
+        if model not in self.known_ids:
+            self.known_ids[model] = set(
+                model.objects.values_list('pk', flat=True)
+            )
+        return self.known_ids[model]
+
+    def build_object(self, row, model):
+        fk_columns = FK_COLUMNS.get(model, {})
+        data = {}
+        for column, value in row.items():
+            if column in fk_columns:
+                attname, related_model = fk_columns[column]
+                if value == '':
+                    data[attname] = None
+                    continue
+                related_id = int(value)
+                if related_id not in self.get_known_ids(related_model):
+                    raise RowError(
+                        f'{related_model.__name__} с id={value} не найден'
+                    )
+                data[attname] = related_id
+            else:
+                field = model._meta.get_field(column)
+                # В CSV пустая строка означает и NULL, и ''.
+                data[field.attname] = (
+                    None if value == '' and field.null
+                    else field.to_python(value)
+                )
+        obj = model(**data)
+        for field in model._meta.concrete_fields:
+            if (getattr(field, 'auto_now_add', False)
+                    and getattr(obj, field.attname) is None):
+                setattr(obj, field.attname, timezone.now())
+        if not self.upsert and obj.pk in self.get_known_ids(model):
+            raise RowError(f'запись с id={obj.pk} уже существует')
+        return obj
+
+    def write(self, write_batch, batch):
+        """Пишет пачку, при конфликте повторяет запись построчно."""
+        try:
+            with transaction.atomic():
+                write_batch(batch)
+            return batch, []
+        except IntegrityError:
+            pass
+        written, failed = [], []
+        for obj in batch:
+            try:
+                with transaction.atomic():
+                    write_batch([obj])
+                written.append(obj)
+            except IntegrityError as error:
+                failed.append((obj, error))
+        return written, failed
+
+    def get_changed(self, model, batch, fields):
+        """Делит пачку на новые записи и изменившиеся существующие."""
+        attnames = [field.attname for field in fields]
+        existing = {
+            values.pop('pk'): values
+            for values in model.objects.filter(
+                pk__in=[obj.pk for obj in batch]
+            ).values('pk', *attnames)
+        }
+        new, changed = [], []
+        for obj in batch:
+            if obj.pk not in existing:
+                new.append(obj)
+            elif any(
+                getattr(obj, attname) != existing[obj.pk][attname]
+                for attname in attnames
+            ):
+                changed.append(obj)
+        return new, changed
+
+    def load_file(self, path, model, chunk=0, chunk_count=1,
+                  byte_range=None):
+        """Загружает файл или его часть из диапазона байт byte_range."""
+        file_name = os.path.basename(path)
+        key = Checkpoints.get_key(file_name, chunk, chunk_count)
+        part = f' [{chunk + 1}/{chunk_count}]' if chunk_count > 1 else ''
+        progress = {'rows': 0, 'done': False}
+        if self.checkpoints:
+            progress = self.checkpoints.get(key)
+        if progress['done']:
+            self.stdout.write(f'{file_name}{part}: уже загружен')
+            return 0, 0
+        self.counts = {'created': 0, 'updated': 0, 'errors': 0}
+        started = time.monotonic()
+        file_transaction = (
+            nullcontext() if self.checkpoints else transaction.atomic()
+        )
+        with open(path, 'r', encoding='utf-8') as f, file_transaction:
+            reader = csv.DictReader(f)
+            if byte_range:
+                reader = csv.DictReader(
+                    read_range(path, *byte_range), reader.fieldnames
+                )
+            fields = [
+                field for field in map(
+                    partial(get_column_field, model), reader.fieldnames
+                )
+                if not field.primary_key
+            ]
+            batch, rows = [], 0
+            for row in reader:
+                rows += 1
+                if rows <= progress['rows']:
+                    continue
+                try:
+                    batch.append(self.build_object(row, model))
+                except (RowError, ValidationError, ValueError,
+                        LookupError) as error:
+                    self.counts['errors'] += 1
+                    self.report_error(
+                        f'{file_name}{part}', f'строка {reader.line_num}',
+                        error
+                    )
+                    continue
+                self.get_known_ids(model).add(batch[-1].pk)
+                if len(batch) >= self.batch_size:
+                    self.flush(file_name, model, batch, fields)
+                    batch = []
+                    self.save_progress(key, rows)
+            self.flush(file_name, model, batch, fields)
+            self.save_progress(key, rows, done=True)
+        elapsed = time.monotonic() - started
+        written = self.counts['created'] + self.counts['updated']
+        self.stdout.write(
+            f'{file_name}{part}: записано {written} строк '
+            f'(новых {self.counts["created"]}, '
+            f'обновлено {self.counts["updated"]}) '
+            f'за {elapsed:.2f} с ({written / max(elapsed, 1e-6):.0f}'
+            f' строк/с), ошибок: {self.counts["errors"]}'
+        )
+        return written, self.counts['errors']
+
+    def flush(self, file_name, model, batch, fields):
+        if not batch:
+            return
+        failed = []
+        if self.upsert:
+            batch, changed = self.get_changed(model, batch, fields)
+            updated, failed = self.write(
+                lambda objs: model.objects.bulk_update(
+                    objs, [field.name for field in fields]
+                ),
+                changed
+            )
+            self.counts['updated'] += len(updated)
+        created, failed_new = self.write(
+            partial(insert_objects, model), batch
+        )
+        self.counts['created'] += len(created)
+        for obj, error in failed + failed_new:
+            self.counts['errors'] += 1
+            self.report_error(file_name, f'id={obj.pk}', error)
+        for obj, error in failed_new:
+            self.get_known_ids(model).discard(obj.pk)
+
+    def save_progress(self, key, rows, done=False):
+        if self.checkpoints:
+            self.checkpoints.save(key, rows, done)
+
+    def report_error(self, file_name, location, error):
+        self.stderr.write(f'{file_name}, {location}: {error}')
+
+
+class CopyLoader:
+    """Загрузка CSV через COPY во временную таблицу (только PostgreSQL).
+
+    Строки копируются как текст, затем одним INSERT ... SELECT
+    приводятся к типам колонок и переносятся в таблицу модели.
+    Строки с несуществующими внешними ключами и конфликтами по
+    уникальности пропускаются. С upsert строки с существующим id
+    обновляют запись, только если значения отличаются.
+    """
+
+    def __init__(self, stdout, stderr, upsert=False, checkpoints=None):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.upsert = upsert
+        self.checkpoints = checkpoints
+        self.failed = False
+
+    def get_cast(self, field, value):
+        # Строковые колонки не приводятся явно: явное приведение к
+        # varchar(n) молча обрезает строку, а присваивание вернет ошибку.
+        if isinstance(field, (CharField, TextField)):
+            # Пустое значение COPY читает как NULL.
+            return value if field.null else f"COALESCE({value}, '')"
+        return f'{value}::{field.cast_db_type(connection)}'
+
+    def get_merge_sql(self, model, staging, header):
+        qn = connection.ops.quote_name
+        fk_columns = FK_COLUMNS.get(model, {})
+        columns, values, conditions, params = [], [], [], []
+        for column in header:
+            field = get_column_field(model, column)
+            if column in fk_columns:
+                _, related_model = fk_columns[column]
+                related_pk = related_model._meta.pk
+                condition = (
+                    f'EXISTS (SELECT 1 FROM '
+                    f'{qn(related_model._meta.db_table)} r '
+                    f'WHERE r.{qn(related_pk.column)} = '
+                    f'{self.get_cast(field, f"s.{qn(column)}")})'
+                )
+                if field.null:
+                    condition = f's.{qn(column)} IS NULL OR {condition}'
+                conditions.append(f'({condition})')
+            columns.append(qn(field.column))
+            values.append(self.get_cast(field, f's.{qn(column)}'))
+        for field in model._meta.concrete_fields:
+            if qn(field.column) in columns or field.primary_key:
+                continue
+            columns.append(qn(field.column))
+            values.append('%s')
+            value = field.get_default()
+            if getattr(field, 'auto_now_add', False):
+                value = timezone.now()
+            params.append(field.get_db_prep_save(value, connection))
+        source = qn(staging)
+        if self.upsert:
+            source, unique_conditions = self.get_unique_sql(
+                model, staging, header
+            )
+            conditions.extend(unique_conditions)
+        sql = (
+            f'INSERT INTO {qn(model._meta.db_table)} AS t '
+            f'({", ".join(columns)}) '
+            f'SELECT {", ".join(values)} FROM {source} s'
+        )
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        return sql + self.get_conflict_sql(model, header), params
+
+    def get_unique_keys(self, model, header):
+        """Уникальные наборы полей модели, все колонки которых есть
+        в CSV, как списки (колонка CSV, поле)."""
+        opts = model._meta
+        columns = {
+            get_column_field(model, column).name: column for column in header
+        }
+        keys = [(field.name,) for field in opts.concrete_fields
+                if field.unique]
+        keys += [tuple(fields) for fields in opts.unique_together]
+        keys += [
+            tuple(constraint.fields) for constraint in opts.constraints
+            if isinstance(constraint, UniqueConstraint)
+            and constraint.condition is None
+        ]
+        return [
+            [(columns[name], opts.get_field(name)) for name in key]
+            for key in keys if all(name in columns for name in key)
+        ]
+
+    def get_unique_sql(self, model, staging, header):
+        """Источник строк и условия для upsert без конфликтов.
+
+        ON CONFLICT DO UPDATE разрешает конфликт только по id, а
+        конфликт по другому уникальному полю или ограничению прервал бы
+        загрузку всего файла. Поэтому из повторов ключа в файле берется
+        первая строка, а строки, ключ которых уже занят записью с другим
+        id, пропускаются.
+        """
+        qn = connection.ops.quote_name
+        opts = model._meta
+        pk_column = next(
+            (column for column in header
+             if get_column_field(model, column).primary_key),
+            None
+        )
+        ranks, conditions = [], []
+        for index, key in enumerate(self.get_unique_keys(model, header)):
+            rank = qn(f'rank_{index}')
+            ranks.append(
+                f'row_number() OVER (PARTITION BY '
+                f'{", ".join(qn(column) for column, _ in key)} '
+                f'ORDER BY ctid) AS {rank}'
+            )
+            # NULL не совпадает с NULL и не нарушает уникальность.
+            conditions.append('(' + ' OR '.join(
+                [f's.{rank} = 1'] + [
+                    f's.{qn(column)} IS NULL'
+                    for column, field in key if field.null
+                ]
+            ) + ')')
+            if pk_column is None or any(
+                    field.primary_key for _, field in key):
+                continue
+            taken = ' AND '.join(
+                f'u.{qn(field.column)} = '
+                f'{self.get_cast(field, f"s.{qn(column)}")}'
+                for column, field in key
+            )
+            conditions.append(
+                f'NOT EXISTS (SELECT 1 FROM {qn(opts.db_table)} u '
+                f'WHERE {taken} AND u.{qn(opts.pk.column)} <> '
+                f'{self.get_cast(opts.pk, f"s.{qn(pk_column)}")})'
+            )
+        if not ranks:
+            return qn(staging), conditions
+        source = f'(SELECT *, {", ".join(ranks)} FROM {qn(staging)})'
+        return source, conditions
+
+    def get_conflict_sql(self, model, header):
+        if not self.upsert:
+            return ' ON CONFLICT DO NOTHING'
+        qn = connection.ops.quote_name
+        columns = [
+            qn(field.column)
+            for field in map(partial(get_column_field, model), header)
+            if not field.primary_key
+        ]
+        assignments = ', '.join(
+            f'{column} = EXCLUDED.{column}' for column in columns
+        )
+        old = ', '.join(f't.{column}' for column in columns)
+        new = ', '.join(f'EXCLUDED.{column}' for column in columns)
+        return (
+            f' ON CONFLICT ({qn(model._meta.pk.column)}) '
+            f'DO UPDATE SET {assignments} '
+            f'WHERE ({old}) IS DISTINCT FROM ({new})'
+        )
+
+    def load_file(self, path, model):
+        qn = connection.ops.quote_name
+        file_name = os.path.basename(path)
+        if self.checkpoints and self.checkpoints.get(file_name)['done']:
+            self.stdout.write(f'{file_name}: уже загружен')
+            return 0, 0
+        staging = f'staging_{model._meta.db_table}'
+        started = time.monotonic()
+        with open(path, 'r', encoding='utf-8') as f:
+            header = next(csv.reader(f))
+            f.seek(0)
+            try:
+                with transaction.atomic(), connection.wrap_database_errors, \
+                        connection.cursor() as cursor:
+                    cursor.execute(
+                        f'CREATE TEMP TABLE {qn(staging)} ('
+                        + ', '.join(f'{qn(column)} text' for column in header)
+                        + ') ON COMMIT DROP'
+                    )
+                    cursor.copy_expert(
+                        f'COPY {qn(staging)} '
+                        f'({", ".join(qn(column) for column in header)}) '
+                        f'FROM STDIN WITH (FORMAT csv, HEADER true)',
+                        f
+                    )
+                    cursor.execute(f'SELECT count(*) FROM {qn(staging)}')
+                    staged_count = cursor.fetchone()[0]
+                    cursor.execute(*self.get_merge_sql(model, staging, header))
+                    created_count = cursor.rowcount
+                    cursor.execute(f'DROP TABLE {qn(staging)}')
+            except (DatabaseError, LookupError) as error:
+                self.stderr.write(f'{file_name}: {error}')
+                self.failed = True
+                return 0, 1
+        if self.checkpoints:
+            self.checkpoints.save(file_name, staged_count, done=True)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{file_name}: записано {created_count} строк '
+            f'за {elapsed:.2f} с ({created_count / max(elapsed, 1e-6):.0f}'
+            f' строк/с), пропущено: {staged_count - created_count}'
+        )
+        return created_count, staged_count - created_count
+
+
+def get_dependencies():
+    """Граф зависимостей файлов по внешним ключам их моделей."""
+    model_files = {
+        model: file_name for file_name, model in FILE_NAMES_MODELS.items()
+    }
+    return {
+        file_name: {
+            model_files[field.related_model]
+            for field in model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in model_files
+            and field.related_model is not model
+        }
+        for file_name, model in FILE_NAMES_MODELS.items()
+    }
+
+
+def make_loader(options, stdout, stderr):
+    checkpoints = None
+    if options['resume']:
+        checkpoints = Checkpoints(CHECKPOINTS_DIR)
+    if options['copy']:
+        return CopyLoader(stdout, stderr, options['upsert'], checkpoints)
+    return BulkLoader(
+        options['batch_size'], stdout, stderr,
+        options['upsert'], checkpoints
+    )
+
+
+def setup_worker(database_name):
+    """Настройка процесса пула.
+
+    Имя БД передается из родителя: под тестами он работает с тестовой
+    базой, а процесс пула иначе подключился бы к основной.
+    """
+    django.setup()
+    connections['default'].settings_dict['NAME'] = database_name
+
+
+def load_chunk(options, file_name, chunk, chunk_count, byte_range):
+    """Задача для процесса пула: у процесса свое подключение к БД."""
+    loader = make_loader(
+        options, OutputWrapper(sys.stdout), OutputWrapper(sys.stderr)
+    )
+    path = os.path.join(FILES_DIR, file_name)
+    started = time.monotonic()
+    try:
+        created_count, error_count = load_part(
+            loader, path, FILE_NAMES_MODELS[file_name], chunk, chunk_count,
+            byte_range
+        )
+    finally:
+        connections.close_all()
+    return (
+        created_count, error_count, loader.failed, started, time.monotonic()
+    )
+
+
 class Command(BaseCommand):
     help = 'Для загрузки данных в БД'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Пакетная загрузка через bulk_create',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Размер пачки для --bulk',
+        )
+        parser.add_argument(
+            '--copy',
+            action='store_true',
+            help='Загрузка через COPY (PostgreSQL), иначе как --bulk',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Число процессов для загрузки с --bulk или --copy',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Сохранять прогресс и продолжить прерванную загрузку',
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Обновлять изменившиеся записи с существующим id',
+        )
+
     def handle(self, *args, **options):
+        if options['workers'] > 1 and not (
+                options['bulk'] or options['copy']):
+            raise CommandError(
+                '--workers используется только с --bulk или --copy'
+            )
         if files := lost_files(FILE_NAMES_MODELS.keys(), FILES_DIR):
             print(f"Отсутствуют необходимые файлы: "
                   f"{', '.join(x for x in files)}.")
             sys.exit('Работа завершена с ошибками.')
 
+        if options['copy'] and connection.vendor != 'postgresql':
+            self.stderr.write(
+                f'COPY не поддерживается для {connection.vendor}, '
+                f'используется пакетная загрузка.'
+            )
+        batched = any(
+            options[name] for name in ('bulk', 'copy', 'resume', 'upsert')
+        )
+        options['copy'] = (
+            options['copy'] and connection.vendor == 'postgresql'
+        )
+        workers = options['workers']
+        if workers > 1 and connection.vendor == 'sqlite':
+            self.stderr.write(
+                'SQLite не поддерживает параллельную запись, '
+                'используется один процесс.'
+            )
+            workers = 1
+        if workers > 1:
+            self.load_parallel(options, workers)
+            return
+        if batched:
+            self.load_with(options)
+            return
+
         for file_name, model in FILE_NAMES_MODELS.items():
             file = os.path.join(FILES_DIR, file_name)
             print(f'Запись из файла: {file_name}')
@@ -100,3 +775,117 @@ class Command(BaseCommand):
             except Exception as error:
                 print(
                     f'Ошибка чтения файла {file_name} и записи в БД: {error}')
+
+    def load_with(self, options):
+        loader = make_loader(options, self.stdout, self.stderr)
+        started = time.monotonic()
+        total = 0
+        for file_name, model in FILE_NAMES_MODELS.items():
+            path = os.path.join(FILES_DIR, file_name)
+            byte_ranges = [None]
+            if not options['copy']:
+                byte_ranges = get_byte_ranges(path, 1, loader.checkpoints)
+            for chunk, byte_range in enumerate(byte_ranges):
+                created_count, _ = load_part(
+                    loader, path, model, chunk, len(byte_ranges), byte_range
+                )
+                total += created_count
+        if loader.checkpoints and not loader.failed:
+            loader.checkpoints.clear()
+        reset_sequences(FILE_NAMES_MODELS.values())
+        rebuild_ratings()
+        rebuild_facets()
+        bump_generations(*CATALOGUE_GROUPS)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'Всего записано {total} строк за {elapsed:.2f} с '
+            f'({total / max(elapsed, 1e-6):.0f} строк/с)'
+        )
+
+    def load_parallel(self, options, workers):
+        """Загружает независимые файлы и части файлов в пуле процессов.
+
+        Файл ставится в очередь, когда загружены все файлы, на которые
+        ссылаются внешние ключи его модели.
+        """
+        options = {
+            name: options[name]
+            for name in ('copy', 'batch_size', 'upsert', 'resume')
+        }
+        checkpoints = None
+        if options['resume']:
+            checkpoints = Checkpoints(CHECKPOINTS_DIR)
+        started = time.monotonic()
+        waiting = get_dependencies()
+        done, futures, chunks_left, report = set(), {}, {}, {}
+        failed = False
+        database_name = connection.settings_dict['NAME']
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=setup_worker,
+            initargs=(database_name,),
+        ) as pool:
+            while waiting or futures:
+                ready = [
+                    file_name for file_name, dependencies in waiting.items()
+                    if dependencies <= done
+                ]
+                for file_name in ready:
+                    del waiting[file_name]
+                    byte_ranges = [None]
+                    if file_name in SPLIT_FILES and not options['copy']:
+                        byte_ranges = get_byte_ranges(
+                            os.path.join(FILES_DIR, file_name), workers,
+                            checkpoints
+                        )
+                    chunk_count = len(byte_ranges)
+                    chunks_left[file_name] = chunk_count
+                    report[file_name] = [0, 0, None, None]
+                    for chunk, byte_range in enumerate(byte_ranges):
+                        future = pool.submit(
+                            load_chunk, options, file_name, chunk,
+                            chunk_count, byte_range
+                        )
+                        futures[future] = file_name
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    file_name = futures.pop(future)
+                    stats = report[file_name]
+                    try:
+                        (created_count, error_count, chunk_failed,
+                         begin, end) = future.result()
+                    except Exception as error:
+                        self.stderr.write(f'{file_name}: {error}')
+                        stats[1] += 1
+                        failed = True
+                    else:
+                        stats[0] += created_count
+                        stats[1] += error_count
+                        failed = failed or chunk_failed
+                        stats[2] = min(stats[2] or begin, begin)
+                        stats[3] = max(stats[3] or end, end)
+                    chunks_left[file_name] -= 1
+                    if not chunks_left[file_name]:
+                        done.add(file_name)
+        if checkpoints and not failed:
+            checkpoints.clear()
+        reset_sequences(FILE_NAMES_MODELS.values())
+        rebuild_ratings()
+        rebuild_facets()
+        bump_generations(*CATALOGUE_GROUPS)
+        self.stdout.write('Файл: строк, ошибок, время')
+        for file_name, (created_count, error_count, begin, end) in (
+                report.items()):
+            elapsed = end - begin if begin is not None else 0
+            self.stdout.write(
+                f'{file_name}: {created_count}, {error_count}, '
+                f'{elapsed:.2f} с'
+            )
+        total = sum(stats[0] for stats in report.values())
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'Всего записано {total} строк за {elapsed:.2f} с '
+            f'({total / max(elapsed, 1e-6):.0f} строк/с)'
+        )
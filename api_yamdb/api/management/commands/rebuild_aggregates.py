@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import bump_generations
+from reviews.aggregates import rebuild_facets, rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает денормализованные рейтинги произведений и счетчики '
+        'произведений категорий и жанров'
+    )
+
+    def handle(self, *args, **options):
+        updated = rebuild_ratings()
+        bump_generations('titles')
+        self.stdout.write(f'Пересчитан рейтинг произведений: {updated}')
+        updated = rebuild_facets()
+        bump_generations('categories', 'genres', 'titles')
+        self.stdout.write(
+            f'Пересчитаны счетчики категорий и жанров: {updated}'
+        )
@@ -0,0 +1,27 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.mail import drain
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые '
+                 'EMAIL_POLL_INTERVAL секунд',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = drain()
+            if sent:
+                self.stdout.write(f'Обработано писем: {sent}')
+            if not options['loop']:
+                return
+            time.sleep(settings.EMAIL_POLL_INTERVAL)
@@ -0,0 +1,294 @@
+"""Метрики запросов в формате Prometheus.
+
+MetricsMiddleware замеряет по каждому маршруту (url_name, например
+titles-list) длительность запроса, число и время SQL-запросов, время
+сериализации (SerializerTimingMixin) и рендеринга (FastJSONRenderer).
+Метрики накапливаются в памяти процесса, поэтому у каждого воркера
+gunicorn свои значения с меткой worker.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework.response import Response
+
+from api.middleware import AsyncCapableMiddleware
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+UNMATCHED_ROUTE = 'unmatched'
+METHODS = ('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class RouteMetrics:
+    __slots__ = (
+        'buckets', 'count', 'duration', 'queries', 'query_time',
+        'serializer_time', 'render_time', 'statuses',
+    )
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.statuses = {}
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def observe(self, route, method, status, duration, timings):
+        with self.lock:
+            metrics = self.routes.get((route, method))
+            if metrics is None:
+                metrics = self.routes[route, method] = RouteMetrics()
+            metrics.buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+            metrics.count += 1
+            metrics.duration += duration
+            metrics.queries += timings['queries']
+            metrics.query_time += timings['query_time']
+            metrics.serializer_time += timings['serializer_time']
+            metrics.render_time += timings['render_time']
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def clear(self):
+        with self.lock:
+            self.routes.clear()
+
+    def export(self):
+        """Текстовый формат Prometheus."""
+        with self.lock:
+            routes = sorted(self.routes.items())
+            lines = []
+            worker = os.getpid()
+            header(
+                lines, 'yamdb_request_duration_seconds', 'histogram',
+                'Длительность запроса'
+            )
+            for (route, method), metrics in routes:
+                labels = (
+                    f'route="{route}",method="{method}",worker="{worker}"'
+                )
+                total = 0
+                for bound, count in zip(
+                        LATENCY_BUCKETS + ('+Inf',), metrics.buckets):
+                    total += count
+                    lines.append(
+                        'yamdb_request_duration_seconds_bucket'
+                        f'{{{labels},le="{bound}"}} {total}'
+                    )
+                lines.append(
+                    f'yamdb_request_duration_seconds_sum{{{labels}}} '
+                    f'{metrics.duration:.6f}'
+                )
+                lines.append(
+                    f'yamdb_request_duration_seconds_count{{{labels}}} '
+                    f'{metrics.count}'
+                )
+            header(
+                lines, 'yamdb_requests_total', 'counter',
+                'Запросы по кодам ответа'
+            )
+            for (route, method), metrics in routes:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(
+                        f'yamdb_requests_total{{route="{route}",'
+                        f'method="{method}",status="{status}",'
+                        f'worker="{worker}"}} {count}'
+                    )
+            for name, attribute, kind, help_text in (
+                ('yamdb_db_queries_total', 'queries', 'counter',
+                 'Число SQL-запросов'),
+                ('yamdb_db_query_seconds_total', 'query_time', 'counter',
+                 'Время SQL-запросов'),
+                ('yamdb_serializer_seconds_total', 'serializer_time',
+                 'counter', 'Время сериализации'),
+                ('yamdb_render_seconds_total', 'render_time', 'counter',
+                 'Время рендеринга ответа'),
+            ):
+                header(lines, name, kind, help_text)
+                for (route, method), metrics in routes:
+                    value = getattr(metrics, attribute)
+                    if isinstance(value, float):
+                        value = f'{value:.6f}'
+                    lines.append(
+                        f'{name}{{route="{route}",method="{method}",'
+                        f'worker="{worker}"}} {value}'
+                    )
+        return '\n'.join(lines) + '\n'
+
+
+def header(lines, name, kind, help_text):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {kind}')
+
+
+registry = Registry()
+
+
+@contextmanager
+def timed(name):
+    """Добавляет время блока к замеру name текущего запроса."""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] += time.perf_counter() - start
+
+
+def count_queries(execute, sql, params, many, context):
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings['queries'] += 1
+        timings['query_time'] += time.perf_counter() - start
+
+
+@contextmanager
+def counting_queries():
+    """Считает SQL-запросы соединений текущего потока."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            if count_queries not in connection.execute_wrappers:
+                stack.enter_context(
+                    connection.execute_wrapper(count_queries)
+                )
+        yield
+
+
+@receiver(connection_created)
+def watch_queries(connection, **kwargs):
+    """Подключает счетчик SQL-запросов к каждому новому соединению.
+
+    Под ASGI представления выполняются в других потоках, чем
+    MetricsMiddleware, и счетчик находит замеры запроса по
+    current_timings, а не по потоку.
+    """
+    if (settings.API_METRICS_ENABLED
+            and count_queries not in connection.execute_wrappers):
+        connection.execute_wrappers.append(count_queries)
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """Собирает метрики запроса; отключается API_METRICS_ENABLED=0.
+
+    Длительность потокового ответа замеряется до конца передачи;
+    SQL-запросы, выполненные при передаче, не учитываются.
+    """
+
+    def __init__(self, get_response):
+        if not settings.API_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def handle(self, request):
+        timings = new_timings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with counting_queries():
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.observe(request, response, start, timings)
+
+    async def ahandle(self, request):
+        timings = new_timings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.observe(request, response, start, timings)
+
+    def observe(self, request, response, start, timings):
+        match = request.resolver_match
+        labels = (
+            match.url_name or UNMATCHED_ROUTE if match else UNMATCHED_ROUTE,
+            request.method if request.method in METHODS else 'OTHER',
+            response.status_code,
+        )
+        if response.streaming:
+            response.streaming_content = observe_stream(
+                response.streaming_content, labels, start, timings
+            )
+        else:
+            registry.observe(
+                *labels, time.perf_counter() - start, timings
+            )
+        return response
+
+
+def new_timings():
+    return {
+        'queries': 0, 'query_time': 0.0,
+        'serializer_time': 0.0, 'render_time': 0.0,
+    }
+
+
+def observe_stream(content, labels, start, timings):
+    """Отдает части ответа и записывает метрики после последней."""
+    try:
+        yield from content
+    finally:
+        registry.observe(*labels, time.perf_counter() - start, timings)
+
+
+def serialize(serializer):
+    """serializer.data с засчитанным временем сериализации."""
+    with timed('serializer_time'):
+        return serializer.data
+
+
+class ListTimingMixin:
+    """list из ListModelMixin с замером времени сериализации."""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serialize(serializer))
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serialize(serializer))
+
+
+class RetrieveTimingMixin:
+    """retrieve из RetrieveModelMixin с замером времени сериализации."""
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object())
+        return Response(serialize(serializer))
+
+
+class SerializerTimingMixin(ListTimingMixin, RetrieveTimingMixin):
+    """Замер сериализации в list и retrieve.
+
+    Для представлений без retrieve подключается только ListTimingMixin,
+    иначе роутер добавит маршрут чтения одного объекта.
+    """
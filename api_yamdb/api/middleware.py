@@ -0,0 +1,32 @@
+"""Основа промежуточных слоев для WSGI и ASGI."""
+import asyncio
+
+
+class AsyncCapableMiddleware:
+    """Промежуточный слой, который под ASGI не уходит в общий поток.
+
+    Синхронный слой Django под ASGI выполняет в одном потоке
+    thread_sensitive, и запросы проходят через него по очереди, даже
+    если сами представления асинхронные. Подклассы реализуют handle()
+    для WSGI и ahandle() для ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django распознает экземпляр как корутинную функцию.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.ahandle(request)
+        return self.handle(request)
+
+    def handle(self, request):
+        return self.get_response(request)
+
+    async def ahandle(self, request):
+        return await self.get_response(request)
@@ -0,0 +1,63 @@
+from rest_framework.pagination import (
+    BasePagination, CursorPagination, PageNumberPagination
+)
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = ('-pub_date', '-id')
+
+
+class NameCursorPagination(CursorPagination):
+    ordering = ('name', 'id')
+
+
+class OptionalCursorPagination(BasePagination):
+    """Постраничная пагинация с курсорной по запросу.
+
+    Курсорная включается параметром ?pagination=cursor или наличием
+    курсора в запросе. Она не выполняет COUNT(*) и выбирает страницу
+    условием по значению первого поля сортировки (name, pub_date), а
+    не OFFSET от начала списка. Остальные поля (id) только упорядочивают
+    записи с одинаковым значением: такие записи DRF пропускает
+    смещением внутри группы. Поэтому время ответа не зависит от номера
+    страницы, пока значения первого поля почти не повторяются; на
+    длинной группе одинаковых названий или дат смещение растет.
+    """
+    cursor_pagination_class = None
+    page_number_pagination_class = PageNumberPagination
+    mode_query_param = 'pagination'
+    mode_cursor = 'cursor'
+
+    def get_delegate(self, request):
+        cursor_class = self.cursor_pagination_class
+        if (request.query_params.get(self.mode_query_param)
+                == self.mode_cursor
+                or cursor_class.cursor_query_param in request.query_params):
+            return cursor_class()
+        return self.page_number_pagination_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.delegate = self.get_delegate(request)
+        return self.delegate.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.delegate.get_paginated_response(data)
+
+    def get_results(self, data):
+        return self.delegate.get_results(data)
+
+    def to_html(self):
+        return self.delegate.to_html()
+
+    @property
+    def display_page_controls(self):
+        delegate = getattr(self, 'delegate', None)
+        return getattr(delegate, 'display_page_controls', False)
+
+
+class TitlePagination(OptionalCursorPagination):
+    cursor_pagination_class = NameCursorPagination
+
+
+class ReviewCommentPagination(OptionalCursorPagination):
+    cursor_pagination_class = PubDateCursorPagination
@@ -4,8 +4,8 @@ from rest_framework import permissions
 class AuthorOrStuffOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         user = request.user
-        return (obj.author == user
-                or request.method in permissions.SAFE_METHODS
+        return (request.method in permissions.SAFE_METHODS
+                or obj.author == user
                 or (not user.is_anonymous
                     and (user.is_moderator or user.is_admin)
                     )
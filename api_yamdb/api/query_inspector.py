@@ -0,0 +1,225 @@
+"""Поиск N+1 и медленных SQL-запросов для разработки и тестов.
+
+Включается настройкой QUERY_INSPECTOR_ENABLED. QueryInspectorMiddleware
+собирает SQL-запросы каждого запроса к приложению, группирует их по
+структуре (без значений параметров и длины списков IN) и сообщает в
+лог api.queries о группах из QUERY_INSPECTOR_REPEAT и более одинаковых
+запросов (признак N+1) и о запросах дольше QUERY_INSPECTOR_SLOW_MS. Для
+каждого найденного запроса указывается место в коде проекта, откуда он
+выполнен. Отчет рассылается сигналом queries_inspected, на который
+подписывается проверка в тестах (tests/fixtures/fixture_queries.py).
+"""
+import hashlib
+import logging
+import re
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import Signal, receiver
+
+from api.middleware import AsyncCapableMiddleware
+
+logger = logging.getLogger('api.queries')
+
+queries_inspected = Signal()
+current_inspector = ContextVar('current_inspector', default=None)
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+ORIGIN_DEPTH = 3
+
+
+def normalize_sql(sql):
+    """Структура запроса: литералы и списки IN заменены заглушками."""
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = IN_LIST.sub('IN (...)', sql)
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint(pattern):
+    return hashlib.md5(pattern.encode()).hexdigest()[:12]
+
+
+def get_origin():
+    """Ближайшие к запросу кадры стека из кода проекта."""
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-1]
+        if frame.filename.startswith(base_dir)
+        and 'site-packages' not in frame.filename
+        and not frame.filename.endswith(('query_inspector.py', 'metrics.py'))
+    ]
+    return tuple(
+        f'{frame.filename[len(base_dir) + 1:]}:{frame.lineno} '
+        f'in {frame.name}'
+        for frame in frames[-ORIGIN_DEPTH:]
+    )
+
+
+class QueryPattern:
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.duration = 0.0
+        self.origin = ()
+
+    @property
+    def fingerprint(self):
+        return fingerprint(self.sql)
+
+
+class SlowQuery:
+    def __init__(self, sql, duration, origin):
+        self.sql = sql
+        self.duration = duration
+        self.origin = origin
+
+
+class QueryReport:
+    def __init__(self, repeated, slow):
+        self.repeated = repeated
+        self.slow = slow
+
+    def __bool__(self):
+        return bool(self.repeated or self.slow)
+
+    def format(self):
+        lines = []
+        for pattern in self.repeated:
+            lines.append(
+                f'N+1 [{pattern.fingerprint}]: {pattern.count} запросов, '
+                f'{pattern.duration * 1000:.1f} мс: {pattern.sql}'
+            )
+            lines.extend(f'    {origin}' for origin in pattern.origin)
+        for query in self.slow:
+            lines.append(
+                f'Медленный запрос {query.duration * 1000:.1f} мс: '
+                f'{query.sql}'
+            )
+            lines.extend(f'    {origin}' for origin in query.origin)
+        return '\n'.join(lines)
+
+
+class QueryInspector:
+    def __init__(self, repeat_threshold=None, slow_ms=None):
+        self.repeat_threshold = (
+            repeat_threshold or settings.QUERY_INSPECTOR_REPEAT
+        )
+        self.slow_seconds = (
+            slow_ms if slow_ms is not None
+            else settings.QUERY_INSPECTOR_SLOW_MS
+        ) / 1000
+        self.patterns = {}
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, time.perf_counter() - start)
+
+    def record(self, sql, duration):
+        key = normalize_sql(sql)
+        pattern = self.patterns.get(key)
+        if pattern is None:
+            pattern = self.patterns[key] = QueryPattern(key)
+        pattern.count += 1
+        pattern.duration += duration
+        # Стек снимается один раз на группу: для N+1 хватает первого
+        # места, а на каждый запрос это слишком дорого.
+        if pattern.count == 2:
+            pattern.origin = get_origin()
+        if duration >= self.slow_seconds:
+            self.slow.append(SlowQuery(sql, duration, get_origin()))
+
+    def report(self):
+        return QueryReport(
+            repeated=[
+                pattern for pattern in self.patterns.values()
+                if pattern.count >= self.repeat_threshold
+            ],
+            slow=self.slow,
+        )
+
+
+def inspect_query(execute, sql, params, many, context):
+    """Передает SQL-запрос инспектору текущего запроса, если он есть."""
+    inspector = current_inspector.get()
+    if inspector is None:
+        return execute(sql, params, many, context)
+    return inspector(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def watch_queries(connection, **kwargs):
+    """Подключает инспектор к каждому новому соединению.
+
+    Под ASGI представления выполняются в других потоках, чем
+    QueryInspectorMiddleware, и запросы находят инспектор по
+    current_inspector, а не по потоку.
+    """
+    if (settings.QUERY_INSPECTOR_ENABLED
+            and inspect_query not in connection.execute_wrappers):
+        connection.execute_wrappers.append(inspect_query)
+
+
+@contextmanager
+def inspecting_queries(inspector=None):
+    """Подключает инспектор к соединениям текущего потока."""
+    inspector = inspector or current_inspector.get()
+    if inspector is None:
+        yield None
+        return
+    token = current_inspector.set(inspector)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                if inspect_query not in connection.execute_wrappers:
+                    stack.enter_context(
+                        connection.execute_wrapper(inspect_query)
+                    )
+            yield inspector
+    finally:
+        current_inspector.reset(token)
+
+
+class QueryInspectorMiddleware(AsyncCapableMiddleware):
+    def __init__(self, get_response):
+        if not settings.QUERY_INSPECTOR_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def handle(self, request):
+        with inspecting_queries(QueryInspector()) as inspector:
+            response = self.get_response(request)
+        return self.report(request, response, inspector)
+
+    async def ahandle(self, request):
+        inspector = QueryInspector()
+        token = current_inspector.set(inspector)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_inspector.reset(token)
+        return self.report(request, response, inspector)
+
+    def report(self, request, response, inspector):
+        report = inspector.report()
+        if report:
+            logger.warning(
+                '%s %s\n%s', request.method, request.path, report.format()
+            )
+        queries_inspected.send(
+            sender=self.__class__, request=request, report=report
+        )
+        return response
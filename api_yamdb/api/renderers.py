@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from api.metrics import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson else None
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Вывод совпадает с JSONRenderer: компактный UTF-8 с экранированием
+    \\u2028 и \\u2029. Типы, которые orjson не знает или кодирует
+    иначе (даты, Decimal, ленивые строки), передаются кодировщику DRF.
+    Форматированный вывод (indent) и нестандартные настройки
+    UNICODE_JSON/COMPACT_JSON обрабатывает родительский класс.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render_time'):
+            return self.render_json(
+                data, accepted_media_type, renderer_context
+            )
+
+    def render_json(self, data, accepted_media_type, renderer_context):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact
+                or self.get_indent(
+                    accepted_media_type, renderer_context or {}
+                ) is not None):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS,
+            )
+        except TypeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
+
+
+class StreamingExportMixin:
+    """Выгрузка всего списка администратором: ?export=1.
+
+    Записи читаются QuerySet.iterator() и отдаются потоком как JSON-массив
+    частями по API_EXPORT_CHUNK_SIZE, без пагинации и без загрузки всех
+    строк в память. Фильтры и поиск списка применяются.
+    """
+    export_query_param = 'export'
+
+    def list(self, request, *args, **kwargs):
+        if not request.query_params.get(self.export_query_param):
+            return super().list(request, *args, **kwargs)
+        user = request.user
+        if user.is_anonymous or not user.is_admin:
+            self.permission_denied(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            self.stream_export(queryset),
+            content_type=FastJSONRenderer.media_type,
+        )
+
+    def stream_export(self, queryset):
+        renderer = FastJSONRenderer()
+        chunk_size = settings.API_EXPORT_CHUNK_SIZE
+        chunk = []
+        first = True
+        yield b'['
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(instance)
+            if len(chunk) == chunk_size:
+                yield self.render_chunk(renderer, chunk, first)
+                chunk, first = [], False
+        if chunk:
+            yield self.render_chunk(renderer, chunk, first)
+        yield b']'
+
+    def render_chunk(self, renderer, chunk, first):
+        data = self.get_serializer(chunk, many=True).data
+        items = renderer.render(data)[1:-1]
+        return items if first else b',' + items
@@ -2,12 +2,12 @@ from django.conf import settings
 from django.core.validators import (
     MinValueValidator, MaxValueValidator
 )
-from django.shortcuts import get_object_or_404
 from rest_framework.serializers import (
     CharField,
     EmailField,
     IntegerField,
     ModelSerializer,
+    PrimaryKeyRelatedField,
     Serializer,
     SlugRelatedField,
     ValidationError
@@ -66,16 +66,30 @@ class ReviewSerializer(ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date',)
 
     def validate(self, data):
-        if self.context.get('request').method != 'POST':
+        request = self.context.get('request')
+        if request.method != 'POST':
             return data
-        reviewer = self.context.get('request').user
-        if get_object_or_404(
-                Title, id=self.context.get('view').kwargs.get('title_id')
-        ).reviews.filter(author=reviewer):
+        title = self.context.get('view').title
+        if title.reviews.filter(author=request.user).exists():
             raise ValidationError(ERROR_REVIEW_AUTHOR_UNIQUE)
         return data
 
 
+class ReviewSearchSerializer(ReviewSerializer):
+    title = PrimaryKeyRelatedField(read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+
+
+class ReviewBulkItemSerializer(Serializer):
+    title_id = IntegerField(min_value=1)
+    text = CharField()
+    score = IntegerField(
+        validators=(MinValueValidator(1), MaxValueValidator(10))
+    )
+
+
 class CommentSerializer(ModelSerializer):
     author = SlugRelatedField(
         read_only=True,
@@ -0,0 +1,55 @@
+from django.db.models import DEFERRED
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import USERNAMES_GROUP, bump_generations
+from reviews.models import (
+    Category, Comment, Genre, GenreTitle, Review, Title, User,
+    queryset_updated
+)
+
+CATALOGUE_GROUP_SENDERS = {
+    Category: 'categories',
+    Genre: 'genres',
+    Title: 'titles',
+    GenreTitle: 'titles',
+    Review: 'titles',
+}
+
+
+def invalidate_catalogue(sender, **kwargs):
+    bump_generations(CATALOGUE_GROUP_SENDERS[sender])
+
+
+for model in CATALOGUE_GROUP_SENDERS:
+    post_save.connect(invalidate_catalogue, sender=model)
+    post_delete.connect(invalidate_catalogue, sender=model)
+    queryset_updated.connect(invalidate_catalogue, sender=model)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_title_reviews(sender, instance, **kwargs):
+    bump_generations(f'reviews:{instance.title_id}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_review_comments(sender, instance, **kwargs):
+    bump_generations(f'comments:{instance.review_id}')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, created=False, **kwargs):
+    bump_generations(f'user:{instance.pk}')
+    loaded_username = getattr(instance, 'loaded_username', DEFERRED)
+    if not created and loaded_username != instance.username:
+        bump_generations(USERNAMES_GROUP)
+    instance.loaded_username = instance.username
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_generations('titles')
@@ -0,0 +1,126 @@
+import hashlib
+from collections.abc import Mapping
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from api.cache import get_cache
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Ограничение частоты запросов скользящим окном.
+
+    Счетчики окон хранятся в общем кеше и увеличиваются атомарно
+    (add + incr), поэтому лимит общий для всех процессов gunicorn при
+    разделяемом бэкенде кеша. С локальным кешем процесса
+    (API_CACHE_SHARED=False, см. is_shared_cache) у каждого воркера свои
+    счетчики и клиент получает лимит на каждый воркер. Число запросов в
+    окне оценивается как счетчик текущего окна плюс доля счетчика
+    предыдущего. Отклоненные запросы тоже учитываются: клиент, который
+    продолжает долбить эндпойнт, остается заблокированным.
+
+    Лимит берется из DEFAULT_THROTTLE_RATES по ключу
+    '<throttle_scope представления>_<scope_suffix>'.
+    """
+    scope_suffix = None
+
+    def __init__(self):
+        # Частота зависит от представления и определяется в allow_request.
+        self.cache = get_cache()
+
+    def get_value(self, request):
+        """Значение, по которому считаются запросы; None — не ограничивать.
+
+        Подклассы переопределяют этот метод, сам класс ничего не
+        ограничивает.
+        """
+        return None
+
+    def get_cache_key(self, request, view):
+        value = self.get_value(request)
+        if not value:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.md5(value.encode()).hexdigest(),
+        }
+
+    def allow_request(self, request, view):
+        self.scope = f'{view.throttle_scope}_{self.scope_suffix}'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        window, self.elapsed = divmod(self.timer(), self.duration)
+        current_key = f'{self.key}:{int(window)}'
+        self.cache.add(current_key, 0, self.duration * 2)
+        try:
+            self.count = self.cache.incr(current_key)
+        except ValueError:
+            # Счетчик вытеснили из кеша между add и incr.
+            self.cache.set(current_key, 1, self.duration * 2)
+            self.count = 1
+        self.previous = self.cache.get(f'{self.key}:{int(window) - 1}', 0)
+        estimate = (
+            self.previous * (1 - self.elapsed / self.duration) + self.count
+        )
+        return estimate <= self.num_requests
+
+    def wait(self):
+        if self.count > self.num_requests:
+            # Ждать конца окна, а затем, пока текущий счетчик не
+            # остынет в роли предыдущего.
+            return (
+                self.duration - self.elapsed
+                + self.duration * (1 - self.num_requests / self.count)
+            )
+        return max(
+            self.duration
+            * (1 - (self.num_requests - self.count) / self.previous)
+            - self.elapsed,
+            0
+        )
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    scope_suffix = 'ip'
+
+    def get_value(self, request):
+        return self.get_ident(request)
+
+
+class DataFieldRateThrottle(SlidingWindowThrottle):
+    """Считает запросы по полю тела запроса, без учета регистра."""
+    field_name = None
+
+    def get_value(self, request):
+        # Тело-список или строка: остается только лимит по IP.
+        if not isinstance(request.data, Mapping):
+            return None
+        value = request.data.get(self.field_name)
+        if not isinstance(value, str):
+            return None
+        return value.strip().lower()
+
+
+class UsernameRateThrottle(DataFieldRateThrottle):
+    scope_suffix = field_name = 'username'
+
+
+class UsernameIPRateThrottle(UsernameRateThrottle):
+    """Считает запросы по паре имя пользователя и IP.
+
+    Лимит только по имени позволил бы любому заблокировать вход чужому
+    пользователю; подбор с многих адресов сдерживает лимит по IP.
+    """
+    scope_suffix = 'username_ip'
+
+    def get_value(self, request):
+        username = super().get_value(request)
+        if username is None:
+            return None
+        return f'{username}:{self.get_ident(request)}'
+
+
+class EmailRateThrottle(DataFieldRateThrottle):
+    scope_suffix = field_name = 'email'
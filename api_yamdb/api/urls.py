@@ -1,7 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from api.views import (
-    SignupView, TokenObtainAPIView, UserViewSet, UserMeAPIView,
+    ExportAPIView, MetricsAPIView, ReviewBulkCreateAPIView,
+    ReviewSearchAPIView, SignupView, TokenObtainAPIView, UserViewSet,
+    UserMeAPIView,
     CategoryViewSet, GenreViewSet, TitleViewSet, CommentViewSet, ReviewViewSet
 )
 
@@ -23,6 +25,20 @@ router_v1.register(URL_REVIEW, ReviewViewSet, basename='review')
 
 urlpatterns = [
     path('v1/users/me/', UserMeAPIView.as_view(), name='self'),
+    path(
+        'v1/titles/reviews/bulk/',
+        ReviewBulkCreateAPIView.as_view(),
+        name='bulk-reviews'
+    ),
+    path(
+        'v1/reviews/search/',
+        ReviewSearchAPIView.as_view(),
+        name='search-reviews'
+    ),
+    path(
+        'v1/export/<str:file_name>/', ExportAPIView.as_view(), name='export'
+    ),
+    path('v1/metrics/', MetricsAPIView.as_view(), name='metrics'),
     path('v1/', include(router_v1.urls)),
     path('v1/', include(auth_urls))
 ]
@@ -0,0 +1,143 @@
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework.serializers import (
+    BaseSerializer, DateTimeField, ListSerializer
+)
+
+from reviews.models import GenreTitle
+
+DATETIME_FIELD = DateTimeField()
+
+
+class ValuesSerializer(BaseSerializer):
+    """Сериализатор для чтения строк из QuerySet.values().
+
+    Строит ответ из словаря напрямую, без экземпляров моделей и обхода
+    полей ModelSerializer. Вывод должен совпадать с выводом обычного
+    сериализатора байт в байт: значения, которые DRF преобразует
+    (даты), проходят через to_representation тех же полей DRF.
+    """
+    values_fields = ()
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    values_fields = ('id', 'text', 'author__username', 'score', 'pub_date')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'score': row['score'],
+            'pub_date': DATETIME_FIELD.to_representation(row['pub_date']),
+        }
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    values_fields = ('id', 'text', 'author__username', 'pub_date')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'pub_date': DATETIME_FIELD.to_representation(row['pub_date']),
+        }
+
+
+def get_title_genres(title_ids):
+    """Жанры произведений одним запросом, в порядке модели Genre."""
+    genres = defaultdict(list)
+    rows = GenreTitle.objects.filter(
+        title_id__in=title_ids, genre_id__isnull=False
+    ).order_by('genre_id__name').values_list(
+        'title_id', 'genre_id__name', 'genre_id__slug'
+    )
+    for title_id, name, slug in rows:
+        genres[title_id].append({'name': name, 'slug': slug})
+    return genres
+
+
+class TitleValuesListSerializer(ListSerializer):
+    def to_representation(self, data):
+        rows = list(data)
+        genres = get_title_genres([row['id'] for row in rows])
+        for row in rows:
+            row['genre'] = genres[row['id']]
+        return super().to_representation(rows)
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    values_fields = (
+        'id', 'name', 'year', 'rating_sum', 'rating_count', 'description',
+        'category__name', 'category__slug',
+    )
+
+    class Meta:
+        list_serializer_class = TitleValuesListSerializer
+
+    def to_representation(self, row):
+        genre = row.get('genre')
+        if genre is None:
+            genre = get_title_genres([row['id']])[row['id']]
+        category = None
+        if row['category__slug'] is not None:
+            category = {
+                'name': row['category__name'],
+                'slug': row['category__slug'],
+            }
+        rating = None
+        if row['rating_count']:
+            rating = int(row['rating_sum'] / row['rating_count'])
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'year': row['year'],
+            'rating': rating,
+            'description': row['description'],
+            'genre': genre,
+            'category': category,
+        }
+
+
+def get_ordering_annotations(queryset):
+    """Аннотации, по которым сортируется queryset (например, search_rank).
+
+    Курсорная пагинация берет значения полей сортировки из записей,
+    поэтому values() должен их сохранить.
+    """
+    ordering = {
+        field.lstrip('-') for field in queryset.query.order_by
+        if isinstance(field, str)
+    }
+    return [name for name in queryset.query.annotations if name in ordering]
+
+
+class ValuesReadMixin:
+    """Отдает list и retrieve через values_serializer_class.
+
+    Включается настройкой API_VALUES_SERIALIZERS.
+    """
+    values_serializer_class = None
+
+    def use_values(self):
+        return (
+            settings.API_VALUES_SERIALIZERS
+            and self.action in ('list', 'retrieve')
+        )
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.use_values():
+            return queryset.prefetch_related(None).values(
+                *self.values_serializer_class.values_fields,
+                *get_ordering_annotations(queryset)
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.use_values():
+            kwargs.setdefault('context', self.get_serializer_context())
+            return self.values_serializer_class(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
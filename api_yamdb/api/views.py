@@ -1,13 +1,14 @@
 import random
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import SearchFilter
+from rest_framework.generics import ListAPIView
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
@@ -21,25 +22,55 @@ from rest_framework.validators import ValidationError
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 from rest_framework_simplejwt.tokens import RefreshToken
-from api.filters import TitleFilterSet
+from api.authentication import CachedJWTAuthentication
+from api.cache import (
+    CachedListMixin, CachedRetrieveMixin, ConditionalListMixin,
+    bump_generations
+)
+from api.export import EXPORT_COLUMNS, gzip_stream, iter_csv
+from api.facets import FacetListMixin
+from api.filters import SearchRankOrderingFilter, TitleFilterSet
+from api.mail import enqueue_email
+from api.metrics import ListTimingMixin, SerializerTimingMixin, registry
+from api.pagination import ReviewCommentPagination, TitlePagination
 from api.permissions import AdminOrReadOnly, AdminOnly, AuthorOrStuffOrReadOnly
+from api.renderers import StreamingExportMixin
 from api.serializers import (
+    ERROR_REVIEW_AUTHOR_UNIQUE,
     CategorySerializer,
     GenreSerializer,
     GetTitleSerializer,
     PostTitleSerializer,
+    ReviewBulkItemSerializer,
+    ReviewSearchSerializer,
     SignupSerializer,
     TokenObtainSerializer,
     UserSerializer,
     ReviewSerializer,
     CommentSerializer
 )
-from reviews.models import Category, Genre, Title, Review, User
+from api.throttling import (
+    EmailRateThrottle, IPRateThrottle, UsernameIPRateThrottle,
+    UsernameRateThrottle
+)
+from api.values import (
+    CommentValuesSerializer,
+    ReviewValuesSerializer,
+    TitleValuesSerializer,
+    ValuesReadMixin
+)
+from reviews.aggregates import change_rating
+from reviews.models import Category, Comment, Genre, Title, Review, User
+from reviews.search import search
 
 ERROR_CONFIRMATION_CODE = 'Неверный код подтверждения, получите новый'
 ERROR_SIGNUP_USERNAME_MAIL_TAKEN = (
     'Пользователь с таким email или username уже существует'
 )
+ERROR_BULK_REVIEWS_LIST = 'Ожидается непустой список отзывов'
+ERROR_BULK_REVIEWS_LIMIT = 'Не больше {} отзывов за запрос'
+ERROR_TITLE_NOT_FOUND = 'Произведение не найдено'
+ERROR_SEARCH_QUERY = 'Укажите поисковый запрос в параметре q'
 
 
 def get_code():
@@ -52,16 +83,22 @@ def get_code():
 
 
 def send_email(user_email, code):
-    send_mail(
+    enqueue_email(
+        recipient=user_email,
         subject=settings.DEFAULT_SUBJECT,
-        message=settings.DEFAULT_MESSAGE.format(code),
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user_email]
+        body=settings.DEFAULT_MESSAGE.format(code)
     )
 
 
 class SignupView(APIView):
+    # Без аутентификации и с лимитами: лишний запрос отклоняется до
+    # обращений к БД и отправки писем.
+    authentication_classes = ()
     permission_classes = [AllowAny]
+    throttle_classes = (
+        IPRateThrottle, UsernameRateThrottle, EmailRateThrottle
+    )
+    throttle_scope = 'signup'
 
     def post(self, request):
         serializer = SignupSerializer(data=request.data)
@@ -82,33 +119,49 @@ class SignupView(APIView):
 
 
 class CategoryGenreViewSet(
-    CreateModelMixin, ListModelMixin,
+    ListTimingMixin, CreateModelMixin, ListModelMixin,
     DestroyModelMixin, GenericViewSet
 ):
     filter_backends = (DjangoFilterBackend, SearchFilter)
     filterset_fields = ('name',)
     search_fields = ('name',)
     lookup_field = 'slug'
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = [AdminOrReadOnly]
 
 
-class CategoryViewSet(CategoryGenreViewSet):
+class CategoryViewSet(
+    StreamingExportMixin, CachedListMixin, CategoryGenreViewSet
+):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_groups = ('categories',)
 
 
-class GenreViewSet(CategoryGenreViewSet):
+class GenreViewSet(
+    StreamingExportMixin, CachedListMixin, CategoryGenreViewSet
+):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_groups = ('genres',)
 
 
-class TitleViewSet(ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+class TitleViewSet(
+    CachedListMixin, CachedRetrieveMixin, FacetListMixin,
+    SerializerTimingMixin, ValuesReadMixin, ModelViewSet
+):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     serializer_class = PostTitleSerializer
+    values_serializer_class = TitleValuesSerializer
     filterset_class = TitleFilterSet
-    filter_backends = (DjangoFilterBackend, OrderingFilter)
+    filter_backends = (DjangoFilterBackend, SearchRankOrderingFilter)
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = [AdminOrReadOnly]
-    ordering = ('name',)
+    pagination_class = TitlePagination
+    cache_groups = ('titles', 'categories', 'genres')
+    ordering = ('name', 'id')
     ordering_fields = ('name',)
 
     def get_serializer_class(self):
@@ -118,7 +171,10 @@ class TitleViewSet(ModelViewSet):
 
 
 class TokenObtainAPIView(APIView):
+    authentication_classes = ()
     permission_classes = [AllowAny]
+    throttle_classes = (IPRateThrottle, UsernameIPRateThrottle)
+    throttle_scope = 'token'
 
     def post(self, request):
         serializer = TokenObtainSerializer(data=request.data)
@@ -141,7 +197,9 @@ class TokenObtainAPIView(APIView):
         )
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(
+    StreamingExportMixin, SerializerTimingMixin, ModelViewSet
+):
     filter_backends = (SearchFilter,)
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -154,46 +212,277 @@ class UserViewSet(ModelViewSet):
 class UserMeAPIView(APIView):
     permission_classes = (IsAuthenticated,)
 
+    def get_user(self):
+        return self.request.user
+
     def get(self, request):
         return Response(
-            UserSerializer(instance=request.user).data,
+            UserSerializer(instance=self.get_user()).data,
             status=status.HTTP_200_OK
         )
 
     def patch(self, request):
         serializer = UserSerializer(
-            instance=request.user, data=request.data, partial=True
+            instance=self.get_user(), data=request.data, partial=True
         )
         serializer.is_valid(raise_exception=True)
         serializer.save(role=serializer.instance.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(ModelViewSet):
+class ExportAPIView(APIView):
+    """Потоковая выгрузка таблицы в CSV формата load_data_db."""
+    permission_classes = (AdminOnly,)
+
+    def get(self, request, file_name):
+        if file_name not in EXPORT_COLUMNS:
+            raise Http404
+        chunks = iter_csv(file_name)
+        if request.query_params.get('gzip'):
+            response = StreamingHttpResponse(
+                gzip_stream(chunks), content_type='application/gzip'
+            )
+            file_name += '.gz'
+        else:
+            response = StreamingHttpResponse(
+                chunks, content_type='text/csv; charset=utf-8'
+            )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{file_name}"'
+        )
+        return response
+
+
+class MetricsAPIView(APIView):
+    """Метрики запросов воркера в текстовом формате Prometheus."""
+    permission_classes = (AdminOnly,)
+
+    def get(self, request):
+        return HttpResponse(
+            registry.export(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+class ReviewViewSet(
+    ConditionalListMixin, SerializerTimingMixin, ValuesReadMixin,
+    ModelViewSet
+):
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = (IsAuthenticatedOrReadOnly, AuthorOrStuffOrReadOnly,)
+    pagination_class = ReviewCommentPagination
 
-    def get_title(self):
+    @cached_property
+    def title(self):
+        """Произведение из URL, загружается один раз за запрос."""
         return get_object_or_404(Title, id=self.kwargs.get('title_id'))
 
+    def get_generation_name(self):
+        return f'reviews:{self.kwargs.get("title_id")}'
+
+    def get_validator_queryset(self):
+        return Review.objects.filter(title_id=self.kwargs.get('title_id'))
+
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        if self.action == 'list':
+            return self.title.reviews.select_related('author')
+        # Отзыв чужого произведения не найдется тем же запросом.
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        serializer.save(author=self.request.user, title=self.title)
 
 
-class CommentViewSet(ModelViewSet):
+class ReviewSearchAPIView(ListTimingMixin, ListAPIView):
+    """Полнотекстовый поиск по всем отзывам: ?q=запрос[&title=id].
+
+    Результаты отсортированы по релевантности.
+    """
+    serializer_class = ReviewSearchSerializer
+    authentication_classes = (CachedJWTAuthentication,)
+    permission_classes = (AllowAny,)
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': [ERROR_SEARCH_QUERY]})
+        queryset = Review.objects.select_related('author')
+        title_id = self.request.query_params.get('title')
+        if title_id:
+            if not title_id.isdigit():
+                raise ValidationError({'title': [ERROR_TITLE_NOT_FOUND]})
+            queryset = queryset.filter(title_id=title_id)
+        return search(queryset, query).order_by('-search_rank', '-id')
+
+
+class ReviewBulkCreateAPIView(APIView):
+    """Пакетное создание отзывов текущего пользователя.
+
+    Принимает список {title_id, text, score} по разным произведениям.
+    Существование произведений и уникальность отзыва автора проверяются
+    двумя запросами на весь список, отзывы вставляются bulk_create, а
+    рейтинг каждого произведения сдвигается один раз. Результат
+    возвращается по каждому элементу: 201 если созданы все, 400 если
+    ни одного, иначе 207.
+    """
+    authentication_classes = (CachedJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError(ERROR_BULK_REVIEWS_LIST)
+        if len(items) > settings.API_BULK_REVIEWS_MAX:
+            raise ValidationError(
+                ERROR_BULK_REVIEWS_LIMIT.format(settings.API_BULK_REVIEWS_MAX)
+            )
+        invalid, valid = {}, {}
+        for index, item in enumerate(items):
+            serializer = ReviewBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                valid[index] = serializer.validated_data
+            else:
+                invalid[index] = serializer.errors
+        try:
+            created, errors = self.create_reviews(valid, invalid)
+        except IntegrityError:
+            # Отзыв на то же произведение успел создать другой запрос:
+            # повтор заново проверяет все элементы.
+            created, errors = self.create_reviews_one_by_one(valid, invalid)
+        results = [
+            {
+                'index': index,
+                'status': status.HTTP_201_CREATED,
+                'review': ReviewSerializer(created[index]).data,
+            } if index in created else {
+                'index': index,
+                'status': status.HTTP_400_BAD_REQUEST,
+                'errors': errors[index],
+            }
+            for index in range(len(items))
+        ]
+        if not created:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response(results, status=response_status)
+
+    def create_reviews_one_by_one(self, valid, invalid):
+        """Повтор после конфликта: каждый элемент в своей транзакции.
+
+        Если другой запрос снова успел создать тот же отзыв, ошибка
+        достается только этому элементу.
+        """
+        created, errors = {}, dict(invalid)
+        for index, data in valid.items():
+            try:
+                item_created, item_errors = self.create_reviews(
+                    {index: data}, {}
+                )
+            except IntegrityError:
+                item_created, item_errors = {}, {
+                    index: {'non_field_errors': [ERROR_REVIEW_AUTHOR_UNIQUE]}
+                }
+            created.update(item_created)
+            errors.update(item_errors)
+        return created, errors
+
+    def create_reviews(self, valid, invalid):
+        """Создает отзывы; возвращает созданные и ошибки по индексам."""
+        author = self.request.user
+        errors = dict(invalid)
+        title_ids = {data['title_id'] for data in valid.values()}
+        with transaction.atomic():
+            titles = set(
+                Title.objects.filter(pk__in=title_ids).order_by().values_list(
+                    'pk', flat=True
+                )
+            )
+            reviewed = set(
+                Review.objects.filter(
+                    author=author, title_id__in=titles
+                ).order_by().values_list('title_id', flat=True)
+            )
+            created = {}
+            for index, data in valid.items():
+                title_id = data['title_id']
+                if title_id not in titles:
+                    errors[index] = {'title_id': [ERROR_TITLE_NOT_FOUND]}
+                elif title_id in reviewed:
+                    errors[index] = {
+                        'non_field_errors': [ERROR_REVIEW_AUTHOR_UNIQUE]
+                    }
+                else:
+                    reviewed.add(title_id)
+                    created[index] = Review(author=author, **data)
+            Review.objects.bulk_create(created.values())
+            if any(review.pk is None for review in created.values()):
+                # Бэкенд не возвращает id из bulk_create (SQLite).
+                ids = dict(
+                    Review.objects.filter(
+                        author=author,
+                        title_id__in=[
+                            review.title_id for review in created.values()
+                        ]
+                    ).order_by().values_list('title_id', 'pk')
+                )
+                for review in created.values():
+                    review.pk = ids[review.title_id]
+            ratings = {}
+            for review in created.values():
+                score, count = ratings.get(review.title_id, (0, 0))
+                ratings[review.title_id] = (score + review.score, count + 1)
+            for title_id, (score, count) in ratings.items():
+                change_rating(title_id, score, count)
+        if ratings:
+            bump_generations(
+                'titles',
+                *(f'reviews:{title_id}' for title_id in ratings)
+            )
+        return created, errors
+
+
+class CommentViewSet(
+    ConditionalListMixin, SerializerTimingMixin, ValuesReadMixin,
+    ModelViewSet
+):
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = (IsAuthenticatedOrReadOnly, AuthorOrStuffOrReadOnly,)
+    pagination_class = ReviewCommentPagination
+
+    @cached_property
+    def review(self):
+        """Отзыв из URL с проверкой, что он относится к произведению."""
+        return get_object_or_404(
+            Review,
+            id=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'),
+        )
 
-    def get_review_object(self):
-        return get_object_or_404(Review, id=self.kwargs.get('review_id'))
+    def get_generation_name(self):
+        return f'comments:{self.kwargs.get("review_id")}'
+
+    def get_validator_queryset(self):
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        )
 
     def get_queryset(self):
-        review = self.get_review_object()
-        return review.comments.all()
+        if self.action == 'list':
+            return self.review.comments.select_related('author')
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        ).select_related('author')
 
     def perform_create(self, serializer):
-        new_review = self.get_review_object()
-        serializer.save(author=self.request.user, review=new_review)
+        serializer.save(author=self.request.user, review=self.review)
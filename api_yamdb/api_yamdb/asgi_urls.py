@@ -0,0 +1,18 @@
+"""Маршруты ASGI-приложения.
+
+Совпадают с api_yamdb.urls, но эндпойнты каталога, отзывов и
+комментариев в них асинхронные (см. api.async_views).
+"""
+from django.contrib import admin
+from django.urls import include, path
+from django.views.generic import TemplateView
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('api/', include('api.async_urls')),
+    path(
+        'redoc/',
+        TemplateView.as_view(template_name='redoc.html'),
+        name='redoc'
+    ),
+]
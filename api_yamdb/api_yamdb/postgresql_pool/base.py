@@ -0,0 +1,131 @@
+"""PostgreSQL с пулом соединений внутри процесса.
+
+Подключается через DB_ENGINE=api_yamdb.postgresql_pool. Закрытие
+соединения Django (в конце запроса при CONN_MAX_AGE=0 или в потоках
+асинхронного чтения) возвращает его в пул, а не рвет. Пул свой у каждого
+процесса и алиаса базы: POOL_SIZE соединений держится открытыми,
+POOL_MAX — предел одновременно выданных. Сверх предела соединение ждет
+освобождения другого не дольше POOL_TIMEOUT секунд.
+"""
+import os
+import threading
+import time
+
+import psycopg2.extras
+from django.conf import settings
+from django.db.backends.postgresql import base
+from django.utils.asyncio import async_unsafe
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+class BlockingConnectionPool(ThreadedConnectionPool):
+    """Пул, который при выданных maxconn соединениях ждет возврата.
+
+    ThreadedConnectionPool в этом случае сразу бросает PoolError, и
+    всплеск запросов сверх POOL_MAX падал бы вместо короткого ожидания.
+    """
+
+    def __init__(self, minconn, maxconn, timeout, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(maxconn)
+        self.returned_at = {}
+
+    def getconn(self, key=None):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise PoolError(
+                f'connection pool exhausted: нет свободного соединения '
+                f'за {self.timeout} с'
+            )
+        try:
+            return super().getconn(key)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        super().putconn(conn, key, close)
+        if conn.closed:
+            self.returned_at.pop(id(conn), None)
+        else:
+            self.returned_at[id(conn)] = time.monotonic()
+        self.slots.release()
+
+    def idle_time(self, conn):
+        """Сколько секунд соединение пролежало в пуле (0 для нового)."""
+        returned_at = self.returned_at.pop(id(conn), None)
+        if returned_at is None:
+            return 0.0
+        return time.monotonic() - returned_at
+
+
+def get_pool(alias, conn_params, size, max_size, timeout):
+    """Пул для алиаса; после fork пул пересоздается."""
+    pid = os.getpid()
+    with pools_lock:
+        owner, pool = pools.get(alias, (None, None))
+        if owner != pid:
+            pool = BlockingConnectionPool(
+                size, max(size, max_size), timeout, **conn_params
+            )
+            pools[alias] = pid, pool
+    return pool
+
+
+def is_alive(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        connection.rollback()
+    except psycopg2.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    @property
+    def pool_size(self):
+        return int(self.settings_dict.get('POOL_SIZE') or 0)
+
+    def get_pool(self, conn_params):
+        return get_pool(
+            self.alias, conn_params, self.pool_size,
+            int(self.settings_dict.get('POOL_MAX') or 0),
+            float(self.settings_dict.get('POOL_TIMEOUT') or 0),
+        )
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        if not self.pool_size:
+            return super().get_new_connection(conn_params)
+        pool = self.get_pool(conn_params)
+        connection = pool.getconn()
+        # Соединение из пула могло умереть, пока лежало без дела.
+        while (settings.DB_HEALTH_CHECKS
+               and pool.idle_time(connection)
+               >= settings.DB_HEALTH_CHECK_INTERVAL
+               and not is_alive(connection)):
+            pool.putconn(connection, close=True)
+            connection = pool.getconn()
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get(
+            'isolation_level', connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if not self.pool_size or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            self.get_pool(self.get_connection_params()).putconn(
+                self.connection, close=self.errors_occurred
+            )
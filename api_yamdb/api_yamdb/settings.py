@@ -36,6 +36,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.query_inspector.QueryInspectorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -43,10 +45,14 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'reviews.routers.ReadYourWritesMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
 
+# Размер пула потоков для асинхронных представлений чтения (ASGI)
+ASYNC_READ_THREADS = int(getenv('ASYNC_READ_THREADS', default=16))
+
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
     {
@@ -75,9 +81,77 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='postgres'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default=5432)
+        'PORT': os.getenv('DB_PORT', default=5432),
+        # Сколько секунд держать соединение открытым между запросами
+        'CONN_MAX_AGE': int(getenv('DB_CONN_MAX_AGE', default=60)),
+        # Пул соединений в процессе, только для
+        # DB_ENGINE=api_yamdb.postgresql_pool (тогда DB_CONN_MAX_AGE=0)
+        'POOL_SIZE': int(getenv('DB_POOL_SIZE', default=4)),
+        'POOL_MAX': int(getenv('DB_POOL_MAX', default=20)),
+        # Сколько секунд ждать свободного соединения при POOL_MAX выданных
+        'POOL_TIMEOUT': float(getenv('DB_POOL_TIMEOUT', default=10)),
+    }
+}
+# Проверять постоянное соединение перед использованием в новом запросе.
+# Проверка - это SELECT 1 на каждое открытое соединение, поэтому она
+# делается, только если соединение простояло без дела дольше
+# DB_HEALTH_CHECK_INTERVAL секунд (0 - перед каждым запросом).
+DB_HEALTH_CHECKS = getenv('DB_HEALTH_CHECKS', default='1') == '1'
+DB_HEALTH_CHECK_INTERVAL = int(getenv('DB_HEALTH_CHECK_INTERVAL', default=5))
+
+# Реплики для чтения: DB_REPLICA_HOSTS=host1,host2 (порт и учетные данные
+# как у основной базы). Чтение в запросах GET к API уходит в реплики.
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+        filter(None, getenv('DB_REPLICA_HOSTS', default='').split(',')), 1):
+    DATABASE_REPLICAS.append(f'replica{number}')
+    DATABASES[f'replica{number}'] = dict(
+        DATABASES['default'], HOST=host.strip(), TEST={'MIRROR': 'default'}
+    )
+# В реплики уходит только чтение каталога (см. reviews.routers): не дольше
+# DB_REPLICA_MAX_LAG секунд отставания и не раньше DB_STICKY_SECONDS после
+# записи того же клиента. Отметка о записи лежит в кеше, поэтому с
+# локальным кешем процесса (API_CACHE_SHARED=False) реплики не используются.
+DATABASE_ROUTERS = ['reviews.routers.CatalogueRouter']
+DB_REPLICA_MAX_LAG = float(getenv('DB_REPLICA_MAX_LAG', default=5))
+DB_REPLICA_LAG_CHECK_INTERVAL = 5
+DB_STICKY_SECONDS = int(getenv('DB_STICKY_SECONDS', default=10))
+
+# Cache
+# Кеш ответов и отметки изменений должны быть общими для всех процессов
+# gunicorn и команд управления (в docker-compose - Memcached). Локальный
+# кеш процесса не видит изменений из других процессов, поэтому с ним
+# кеш ответов и ответы 304 выключены (API_CACHE_SHARED).
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
     }
 }
+API_CACHE_ALIAS = 'default'
+API_CACHE_SHARED = CACHES[API_CACHE_ALIAS]['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+API_CACHE_TIMEOUT = 60 * 60
+AUTH_USER_CACHE_TIMEOUT = 5 * 60
+# Списки и детальные страницы произведений, отзывов и комментариев
+# сериализуются из QuerySet.values() (см. api.values)
+API_VALUES_SERIALIZERS = getenv('API_VALUES_SERIALIZERS', default='0') == '1'
+API_EXPORT_CHUNK_SIZE = 2000
+API_BULK_REVIEWS_MAX = 500
+# Метрики запросов для Prometheus (см. api.metrics, /api/v1/metrics/)
+API_METRICS_ENABLED = getenv('API_METRICS_ENABLED', default='1') == '1'
+# Поиск N+1 и медленных SQL-запросов (см. api.query_inspector)
+QUERY_INSPECTOR_ENABLED = (
+    getenv('QUERY_INSPECTOR_ENABLED', default='0') == '1'
+)
+QUERY_INSPECTOR_REPEAT = 5
+QUERY_INSPECTOR_SLOW_MS = 100
 
 # User model options
 
@@ -144,8 +218,25 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # Лимиты регистрации и получения токена (см. api.throttling).
+    # Счетчики в кеше: с локальным кешем процесса (API_CACHE_SHARED=False)
+    # лимит действует в каждом воркере отдельно.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': getenv('THROTTLE_SIGNUP_IP', default='20/hour'),
+        'signup_username': '5/hour',
+        'signup_email': '5/hour',
+        'token_ip': getenv('THROTTLE_TOKEN_IP', default='60/hour'),
+        'token_username_ip': '10/hour',
+    },
+    # Число прокси перед приложением (nginx), чтобы брать IP клиента из
+    # X-Forwarded-For
+    'NUM_PROXIES': int(getenv('NUM_PROXIES', default=1)),
 }
 
 SIMPLE_JWT = {
@@ -165,3 +256,12 @@ EMAIL_HOST_PASSWORD = getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 DEFAULT_SUBJECT = 'Код подтверждения от Yamdb'
 DEFAULT_MESSAGE = 'Ваш код подтверждения - {}'
+
+# Письма отправляются из очереди в БД (OutgoingEmail): фоновым потоком
+# веб-процесса или командой send_emails --loop, если поток отключен.
+EMAIL_OUTBOX_WORKER = getenv('EMAIL_OUTBOX_WORKER', default='1') == '1'
+EMAIL_BATCH_SIZE = 50
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_DELAY = 30
+EMAIL_CLAIM_TIMEOUT = 5 * 60
+EMAIL_POLL_INTERVAL = 60
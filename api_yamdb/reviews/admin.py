@@ -1,8 +1,30 @@
 from django.contrib import admin
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from django.db.models import Q
+from reviews.models import (
+    Category, Comment, Genre, OutgoingEmail, Review, Title, User
+)
+from reviews.search import get_search_fields, search
 
 
-class ReviewAdmin(admin.ModelAdmin):
+class FullTextSearchMixin:
+    """Поиск в админке через полнотекстовый индекс вместо LIKE.
+
+    Поля из search_fields, которых нет в индексе (например,
+    category__name), ищутся обычным icontains.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        indexed = get_search_fields(queryset.model)
+        condition = Q(pk__in=search(queryset, search_term).values('pk'))
+        for field in self.get_search_fields(request):
+            if field not in indexed:
+                condition |= Q(**{f'{field}__icontains': search_term})
+        return queryset.filter(condition), False
+
+
+class ReviewAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = (
         'pk',
         'title',
@@ -16,7 +38,7 @@ class ReviewAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = (
         'pk',
         'review',
@@ -56,8 +78,16 @@ class GenreAdmin(admin.ModelAdmin):
 
 
 @admin.register(Title)
-class TitleAdmin(admin.ModelAdmin):
+class TitleAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ('name', 'year', 'category')
     search_fields = ('name', 'category__name', 'description')
-    list_filter = ('year',)
+    list_filter = ('year', 'category')
+    empty_value_display = '-пусто-'
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'recipient', 'subject', 'sent_at', 'attempts')
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
     empty_value_display = '-пусто-'
@@ -0,0 +1,65 @@
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+
+
+def change_rating(title_id, score_delta, count_delta):
+    """Сдвигает сумму и количество оценок произведения на дельту."""
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+    )
+
+
+def rebuild_ratings(title_ids=None):
+    """Пересчитывает рейтинг произведений по таблице отзывов."""
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return titles.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0
+        ),
+    )
+
+
+def change_title_count(model, pk, delta):
+    """Сдвигает счетчик произведений категории или жанра на дельту."""
+    if pk is not None:
+        model.objects.filter(pk=pk).update(
+            title_count=F('title_count') + delta
+        )
+
+
+def rebuild_facets(category_ids=None, genre_ids=None):
+    """Пересчитывает счетчики произведений категорий и жанров.
+
+    Без аргументов пересчитываются все категории и жанры.
+    """
+    categories = Category.objects.all()
+    if category_ids is not None:
+        categories = categories.filter(pk__in=category_ids)
+    titles = Title.objects.filter(
+        category=OuterRef('pk')
+    ).order_by().values('category')
+    updated = categories.update(title_count=Coalesce(
+        Subquery(titles.annotate(total=Count('pk')).values('total')), 0
+    ))
+    genres = Genre.objects.all()
+    if genre_ids is not None:
+        genres = genres.filter(pk__in=genre_ids)
+    links = GenreTitle.objects.filter(
+        genre_id=OuterRef('pk')
+    ).order_by().values('genre_id')
+    return updated + genres.update(title_count=Coalesce(
+        Subquery(links.annotate(total=Count('pk')).values('total')), 0
+    ))
@@ -0,0 +1,107 @@
+from django.db import migrations
+
+# Таблица -> выражения документа для поиска (поле, вес в PostgreSQL).
+SEARCH_TABLES = {
+    'reviews_title': (('name', 'A'), ('description', 'B')),
+    'reviews_review': (('text', 'A'),),
+    'reviews_comment': (('text', 'A'),),
+}
+
+
+def get_document(fields, row=''):
+    return ' || '.join(
+        f"setweight(to_tsvector('russian', coalesce({row}{field}, '')), "
+        f"'{weight}')"
+        for field, weight in fields
+    )
+
+
+def get_postgresql_sql(table, fields):
+    # Триггер срабатывает только при изменении текстовых полей, чтобы
+    # частые обновления рейтинга не пересчитывали документ.
+    columns = ', '.join(field for field, _ in fields)
+    return [
+        f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector',
+        f'CREATE OR REPLACE FUNCTION {table}_search_update() '
+        f'RETURNS trigger AS $$ BEGIN '
+        f'NEW.search_vector := {get_document(fields, "NEW.")}; '
+        f'RETURN NEW; END $$ LANGUAGE plpgsql',
+        f'DROP TRIGGER IF EXISTS {table}_search_trigger ON {table}',
+        f'CREATE TRIGGER {table}_search_trigger '
+        f'BEFORE INSERT OR UPDATE OF {columns} ON {table} '
+        f'FOR EACH ROW EXECUTE FUNCTION {table}_search_update()',
+        f'UPDATE {table} SET search_vector = {get_document(fields)}',
+        f'CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table} '
+        f'USING gin (search_vector)',
+    ]
+
+
+def get_sqlite_sql(table, fields):
+    # Триггеры пропадут, если SQLite пересоздаст таблицу при ее изменении
+    # в будущей миграции: тогда их нужно создать заново.
+    fts = f'{table}_fts'
+    columns = ', '.join(field for field, _ in fields)
+    new = ', '.join(f'new.{field}' for field, _ in fields)
+    old = ', '.join(f'old.{field}' for field, _ in fields)
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    insert = f'INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new});'
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, "
+        f"content='{table}', content_rowid='id')",
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} '
+        f'BEGIN {insert} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} '
+        f'BEGIN {delete} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_au '
+        f'AFTER UPDATE OF {columns} ON {table} '
+        f'BEGIN {delete} {insert} END',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def create_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        get_sql = get_postgresql_sql
+    elif vendor == 'sqlite':
+        get_sql = get_sqlite_sql
+    else:
+        return
+    for table, fields in SEARCH_TABLES.items():
+        for sql in get_sql(table, fields):
+            schema_editor.execute(sql)
+
+
+def drop_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table in SEARCH_TABLES:
+        if vendor == 'postgresql':
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS {table}_search_trigger ON {table}'
+            )
+            schema_editor.execute(
+                f'DROP FUNCTION IF EXISTS {table}_search_update()'
+            )
+            schema_editor.execute(
+                f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector'
+            )
+        elif vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(
+                    f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}'
+                )
+            schema_editor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search, drop_search),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_title_counts(apps, schema_editor):
+    Category = apps.get_model('reviews', 'Category')
+    Genre = apps.get_model('reviews', 'Genre')
+    Title = apps.get_model('reviews', 'Title')
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    titles = Title.objects.filter(
+        category=OuterRef('pk')
+    ).order_by().values('category')
+    Category.objects.update(title_count=Coalesce(
+        Subquery(titles.annotate(total=Count('pk')).values('total')), 0
+    ))
+    links = GenreTitle.objects.filter(
+        genre_id=OuterRef('pk')
+    ).order_by().values('genre_id')
+    Genre.objects.update(title_count=Coalesce(
+        Subquery(links.annotate(total=Count('pk')).values('total')), 0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='title_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество произведений'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='title_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество произведений'),
+        ),
+        migrations.RunPython(fill_title_counts, migrations.RunPython.noop),
+    ]
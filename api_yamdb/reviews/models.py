@@ -2,6 +2,8 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.dispatch import Signal
+from django.utils import timezone
 from reviews.validators import (
     validate_non_reserved,
     validate_username_allowed_chars,
@@ -58,6 +60,14 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_username = dict(zip(field_names, values)).get(
+            'username', models.DEFERRED
+        )
+        return instance
+
     @property
     def is_moderator(self):
         return self.role == settings.ROLE_MODERATOR
@@ -67,6 +77,31 @@ class User(AbstractUser):
         return (self.role == settings.ROLE_ADMIN) or self.is_staff
 
 
+queryset_updated = Signal()
+
+
+class CatalogueQuerySet(models.QuerySet):
+    """Сообщает об update() и bulk_create() сигналом queryset_updated.
+
+    Эти методы не отправляют post_save, а по сигналу сбрасывается кеш
+    ответов (см. api.signals).
+    """
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            queryset_updated.send(sender=self.model)
+        return rows
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if objs:
+            queryset_updated.send(sender=self.model)
+        return objs
+
+
 class CategoryGenreBaseModel(models.Model):
     name = models.CharField(
         max_length=256,
@@ -78,6 +113,13 @@ class CategoryGenreBaseModel(models.Model):
         unique=True,
         verbose_name='Идентификатор'
     )
+    title_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество произведений'
+    )
+
+    objects = CatalogueQuerySet.as_manager()
 
     class Meta:
         abstract = True
@@ -123,15 +165,45 @@ class Title(models.Model):
         verbose_name='Жанры'
     )
     description = models.TextField()
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок'
+    )
+
+    objects = CatalogueQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_category_id = dict(
+            zip(field_names, values)
+        ).get('category_id', models.DEFERRED)
+        return instance
+
 
 class GenreTitle(models.Model):
     genre_id = models.ForeignKey(
@@ -142,6 +214,8 @@ class GenreTitle(models.Model):
     )
     title_id = models.ForeignKey(Title, on_delete=models.CASCADE)
 
+    objects = CatalogueQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -169,6 +243,8 @@ class TextAuthorDateBaseModel(models.Model):
         auto_now_add=True
     )
 
+    objects = CatalogueQuerySet.as_manager()
+
     class Meta:
         ordering = ('-pub_date',)
         abstract = True
@@ -200,6 +276,22 @@ class Review(TextAuthorDateBaseModel):
                 name='unique_title_author'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('title', '-pub_date'),
+                name='review_title_pub_date_idx'
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance.loaded_rating = (
+            loaded.get('title_id', models.DEFERRED),
+            loaded.get('score', models.DEFERRED),
+        )
+        return instance
 
 
 class Comment(TextAuthorDateBaseModel):
@@ -213,3 +305,50 @@ class Comment(TextAuthorDateBaseModel):
     class Meta(TextAuthorDateBaseModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', '-pub_date'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
+
+
+class OutgoingEmail(models.Model):
+    recipient = models.EmailField(
+        max_length=settings.EMAIL_MAX_LENGTH,
+        verbose_name='Получатель'
+    )
+    subject = models.CharField(max_length=256, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создано'
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Отправить после'
+    )
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Отправлено'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=('sent_at', 'send_after'),
+                name='outgoing_email_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient} - {self.subject}'
@@ -0,0 +1,102 @@
+"""Маршрутизация чтения каталога в реплики.
+
+Чтение произведений, категорий, жанров, отзывов и комментариев в
+запросах на чтение к API уходит в реплики DATABASE_REPLICAS, все прочие
+модели (пользователи, очередь писем) всегда читаются из основной базы.
+Реплика не используется, если она отстает больше DB_REPLICA_MAX_LAG
+секунд, и для клиента, который сам что-то записал за последние
+DB_STICKY_SECONDS секунд: он должен увидеть свои изменения. Отметка о
+записи хранится в кеше, и следующий запрос клиента может попасть в
+другой процесс, поэтому без общего кеша (API_CACHE_SHARED) реплики не
+используются.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from api.cache import is_shared_cache
+from api.db import ReplicaReadMiddleware, ReplicaRouter, use_replicas
+
+CATALOGUE_MODELS = {
+    'reviews.Category', 'reviews.Genre', 'reviews.Title',
+    'reviews.GenreTitle', 'reviews.Review', 'reviews.Comment',
+}
+REPLICA_LAG_SQL = (
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() '
+    'THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM '
+    'now() - pg_last_xact_replay_timestamp()), 0) END'
+)
+
+replica_lags = {}
+replica_lags_lock = threading.Lock()
+
+
+def get_replica_lag(alias):
+    """Отставание реплики в секундах, замеряется раз в интервал.
+
+    Недоступная реплика считается бесконечно отстающей.
+    """
+    now = time.monotonic()
+    with replica_lags_lock:
+        checked, lag = replica_lags.get(alias, (None, None))
+    if checked is not None and (
+            now - checked < settings.DB_REPLICA_LAG_CHECK_INTERVAL):
+        return lag
+    connection = connections[alias]
+    lag = 0
+    if connection.vendor == 'postgresql':
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = float(cursor.fetchone()[0] or 0)
+        except DatabaseError:
+            lag = float('inf')
+    with replica_lags_lock:
+        replica_lags[alias] = now, lag
+    return lag
+
+
+def get_sticky_key(request):
+    """Ключ клиента в кеше по заголовку Authorization (без запроса к БД)."""
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if not authorization:
+        return None
+    digest = hashlib.md5(authorization.encode()).hexdigest()
+    return f'db-sticky:{digest}'
+
+
+class CatalogueRouter(ReplicaRouter):
+
+    def get_replicas(self, model):
+        if (model._meta.label not in CATALOGUE_MODELS
+                or not is_shared_cache()):
+            return []
+        return [
+            alias for alias in super().get_replicas(model)
+            if get_replica_lag(alias) <= settings.DB_REPLICA_MAX_LAG
+        ]
+
+
+class ReadYourWritesMiddleware(ReplicaReadMiddleware):
+    """Не отправляет в реплики чтение клиента сразу после его записи."""
+
+    def process_response(self, request, response):
+        key = get_sticky_key(request)
+        if (key and request.method not in SAFE_METHODS
+                and response.status_code < 400):
+            caches[settings.API_CACHE_ALIAS].set(
+                key, True, settings.DB_STICKY_SECONDS
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        super().process_view(request, view_func, view_args, view_kwargs)
+        key = get_sticky_key(request)
+        if (use_replicas.get() and key
+                and caches[settings.API_CACHE_ALIAS].get(key)):
+            use_replicas.set(False)
@@ -0,0 +1,86 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Func, Q, Value
+from django.db.models.expressions import Col, CombinedExpression, RawSQL
+
+# Конфигурация полнотекстового поиска PostgreSQL, совпадает с миграцией
+# 0005_search.
+SEARCH_CONFIG = 'russian'
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def get_search_fields(model):
+    from reviews.models import Comment, Review, Title
+    return {
+        Title: ('name', 'description'),
+        Review: ('text',),
+        Comment: ('text',),
+    }[model]
+
+
+def make_fts_query(query):
+    """Запрос FTS5: все слова запроса в кавычках, через AND."""
+    return ' '.join(
+        '"{}"'.format(token) for token in TOKEN_PATTERN.findall(query)
+    )
+
+
+def get_search_vector(queryset):
+    """Колонка search_vector таблицы запроса (только PostgreSQL).
+
+    Col, а не RawSQL с именем таблицы: Django переименовывает колонку
+    вместе с таблицей, когда запрос становится подзапросом (U0 в
+    pk__in и titles__in), и подзапрос использует GIN-индекс.
+    """
+    from django.contrib.postgres.search import SearchVectorField
+
+    field = SearchVectorField()
+    field.set_attributes_from_name('search_vector')
+    return Col(queryset.query.get_initial_alias(), field)
+
+
+def search(queryset, query):
+    """Полнотекстовый поиск с аннотацией релевантности search_rank.
+
+    На PostgreSQL используется колонка search_vector с GIN-индексом,
+    на SQLite - таблица FTS5 <таблица>_fts; обе поддерживают триггеры
+    из миграции 0005_search. На прочих бэкендах поиск сводится к
+    icontains по полям get_search_fields() с нулевой релевантностью.
+    Результат можно использовать как подзапрос.
+    """
+    model = queryset.model
+    queryset = queryset.all()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        vector = get_search_vector(queryset)
+        tsquery = SearchQuery(
+            query, config=SEARCH_CONFIG, search_type='websearch'
+        )
+        return queryset.filter(CombinedExpression(
+            vector, '@@', tsquery, output_field=BooleanField()
+        )).annotate(search_rank=SearchRank(vector, tsquery))
+    if connection.vendor == 'sqlite':
+        fts_query = make_fts_query(query)
+        if not fts_query:
+            return queryset.none().annotate(search_rank=Value(0.0))
+        fts = connection.ops.quote_name(f'{model._meta.db_table}_fts')
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [fts_query]
+        )).annotate(search_rank=Func(
+            Value(fts_query), F('pk'),
+            template=(
+                f'(SELECT -bm25({fts}) FROM {fts} '
+                f'WHERE {fts} MATCH %(expressions)s)'
+            ),
+            arg_joiner=' AND rowid = ',
+            output_field=FloatField(),
+        ))
+    condition = Q()
+    for field in get_search_fields(model):
+        condition |= Q(**{f'{field}__icontains': query})
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
@@ -0,0 +1,79 @@
+from django.db.models import DEFERRED, F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.aggregates import (
+    change_rating, change_title_count, rebuild_facets, rebuild_ratings
+)
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    score = int(instance.score)
+    if created:
+        change_rating(instance.title_id, score, 1)
+    else:
+        old_title_id, old_score = getattr(
+            instance, 'loaded_rating', (DEFERRED, DEFERRED)
+        )
+        if DEFERRED in (old_title_id, old_score):
+            rebuild_ratings([instance.title_id])
+        elif old_title_id != instance.title_id:
+            change_rating(old_title_id, -old_score, -1)
+            change_rating(instance.title_id, score, 1)
+        elif old_score != score:
+            change_rating(instance.title_id, score - old_score, 0)
+    instance.loaded_rating = (instance.title_id, score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    change_rating(instance.title_id, -int(instance.score), -1)
+
+
+@receiver(post_save, sender=Title)
+def update_category_count_on_save(sender, instance, created, **kwargs):
+    old_category_id = getattr(instance, 'loaded_category_id', DEFERRED)
+    if created:
+        change_title_count(Category, instance.category_id, 1)
+    elif old_category_id is DEFERRED:
+        rebuild_facets(category_ids=[instance.category_id], genre_ids=[])
+    elif old_category_id != instance.category_id:
+        change_title_count(Category, old_category_id, -1)
+        change_title_count(Category, instance.category_id, 1)
+    instance.loaded_category_id = instance.category_id
+
+
+@receiver(post_delete, sender=Title)
+def update_category_count_on_delete(sender, instance, **kwargs):
+    change_title_count(Category, instance.category_id, -1)
+
+
+# Title.genre.add() и set() вставляют GenreTitle через bulk_create без
+# post_save, поэтому добавление учитывается по m2m_changed. Удаление
+# связей (remove, clear, каскад) всегда проходит через post_delete.
+@receiver(post_save, sender=GenreTitle)
+def update_genre_count_on_save(sender, instance, created, **kwargs):
+    if created:
+        change_title_count(Genre, instance.genre_id_id, 1)
+    else:
+        rebuild_facets(category_ids=[])
+
+
+@receiver(post_delete, sender=GenreTitle)
+def update_genre_count_on_delete(sender, instance, **kwargs):
+    change_title_count(Genre, instance.genre_id_id, -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_genre_count_on_add(sender, instance, action, reverse, pk_set,
+                              **kwargs):
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        change_title_count(Genre, instance.pk, len(pk_set))
+    else:
+        Genre.objects.filter(pk__in=pk_set).update(
+            title_count=F('title_count') + 1
+        )
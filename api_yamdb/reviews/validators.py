@@ -17,9 +17,9 @@ def validate_non_reserved(value):
 
 
 def validate_username_allowed_chars(value):
-    invalid_chars = ''.join(
-        set(settings.USERNAME_VALID_PATTERN.sub('', value))
-    )
+    invalid_chars = ''.join(dict.fromkeys(
+        ''.join(settings.USERNAME_INVALID_PATTERN.findall(value))
+    ))
     if invalid_chars:
         raise ValidationError(
             ERROR_USERNAME_SYMBOL.format(invalid_chars)
@@ -0,0 +1,71 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import caches
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings):
+    # Тесты идут в одном процессе, локальный кеш для них общий.
+    settings.API_CACHE_SHARED = True
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def category():
+    from reviews.models import Category
+    return Category.objects.create(name='Фильм', slug='movie')
+
+
+@pytest.fixture
+def genres():
+    from reviews.models import Genre
+    return [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+
+
+@pytest.fixture
+def make_catalogue(category, genres, django_user_model):
+    """Создает count произведений, отзывов и комментариев."""
+    from reviews.models import Comment, Review, Title
+
+    def make(count):
+        titles, reviews = [], []
+        for index in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {index}',
+                year=2000,
+                category=category,
+                description='Описание',
+            )
+            title.genre.set(genres)
+            titles.append(title)
+        title = titles[0]
+        for index in range(count):
+            author = django_user_model.objects.create(
+                username=f'author{index}',
+                email=f'author{index}@yamdb.fake',
+            )
+            review = Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+            Comment.objects.create(
+                review=reviews[0] if reviews else review,
+                author=author,
+                text='Комментарий',
+            )
+            reviews.append(review)
+        return titles, reviews
+
+    return make
@@ -0,0 +1,70 @@
+"""Проверка тестов на новые N+1 (pytest --query-inspector).
+
+Каждый запрос к приложению в тесте проходит через
+api.query_inspector; тест падает, если в нем найдена группа одинаковых
+SQL-запросов, отпечатка которой нет в n_plus_one_allowlist.txt.
+Тесты, которые создают N+1 намеренно, отмечаются allow_n_plus_one.
+"""
+from pathlib import Path
+
+import pytest
+
+ALLOWLIST_PATH = Path(__file__).with_name('n_plus_one_allowlist.txt')
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--query-inspector', action='store_true',
+        help='Падать на новых N+1 в запросах к API',
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'allow_n_plus_one: не проверять тест на N+1'
+    )
+
+
+def read_allowlist():
+    if not ALLOWLIST_PATH.exists():
+        return set()
+    return {
+        line.split('#', 1)[0].strip()
+        for line in ALLOWLIST_PATH.read_text().splitlines()
+    } - {''}
+
+
+@pytest.fixture(autouse=True)
+def query_inspector(request):
+    if (not request.config.getoption('--query-inspector')
+            or request.node.get_closest_marker('allow_n_plus_one')):
+        yield None
+        return
+    from api.query_inspector import queries_inspected
+    settings = request.getfixturevalue('settings')
+    settings.QUERY_INSPECTOR_ENABLED = True
+    reports = []
+
+    def collect(sender, request, report, **kwargs):
+        reports.append((request, report))
+
+    queries_inspected.connect(collect)
+    try:
+        yield reports
+    finally:
+        queries_inspected.disconnect(collect)
+    allowlist = read_allowlist()
+    found = [
+        f'{http_request.method} {http_request.path}\n'
+        f'N+1 [{pattern.fingerprint}]: {pattern.count} x {pattern.sql}\n'
+        + '\n'.join(f'    {origin}' for origin in pattern.origin)
+        for http_request, report in reports
+        for pattern in report.repeated
+        if pattern.fingerprint not in allowlist
+    ]
+    if found:
+        pytest.fail(
+            'Новые повторяющиеся SQL-запросы (исправьте или добавьте '
+            f'отпечаток в {ALLOWLIST_PATH.name}):\n' + '\n'.join(found),
+            pytrace=False,
+        )
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+async def asgi_request(application, path, query_string='', headers=()):
+    """GET через ASGI-приложение: статус и тело ответа."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), *headers],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    return messages[0]['status'], body
+
+
+def asgi_get(path, query_string='', headers=()):
+    """GET через ASGI-приложение проекта: статус и тело ответа."""
+    from api_yamdb.asgi import application
+    return async_to_sync(asgi_request)(
+        application, path, query_string, headers
+    )
+
+
+def admin_headers(django_user_model):
+    admin = django_user_model.objects.create(
+        username='admin', email='admin@yamdb.fake', role='admin'
+    )
+    token = AccessToken.for_user(admin)
+    return [(b'authorization', f'Bearer {token}'.encode())]
+
+
+class TestAsyncUrls:
+
+    @pytest.mark.parametrize('path, is_async', [
+        ('/api/v1/titles/', True),
+        ('/api/v1/titles/1/', True),
+        ('/api/v1/titles/1/reviews/', True),
+        ('/api/v1/titles/1/reviews/1/comments/', True),
+        ('/api/v1/categories/', True),
+        ('/api/v1/users/me/', False),
+        ('/api/v1/auth/signup/', False),
+    ])
+    def test_read_endpoints_are_async(self, path, is_async):
+        match = resolve(path, urlconf='api_yamdb.asgi_urls')
+        assert asyncio.iscoroutinefunction(match.func) is is_async, (
+            f'Проверьте, какие представления для {path} асинхронные'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncResponses:
+
+    def test_async_list_matches_sync(self, api_client, settings,
+                                     make_catalogue):
+        titles, _ = make_catalogue(3)
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        expected = api_client.get(url).json()
+        settings.ROOT_URLCONF = 'api_yamdb.asgi_urls'
+
+        async def get():
+            return await AsyncClient().get(url)
+
+        response = async_to_sync(get)()
+        assert response.status_code == 200
+        assert response.json() == expected, (
+            'Проверьте, что асинхронное представление отдает те же данные'
+        )
+
+    def test_streaming_export(self, settings, make_catalogue,
+                              django_user_model):
+        from reviews.models import Category
+        make_catalogue(1)
+        for index in range(5):
+            Category.objects.create(name=f'Категория {index}',
+                                    slug=f'category-{index}')
+        settings.API_EXPORT_CHUNK_SIZE = 2
+        status, body = asgi_get(
+            '/api/v1/categories/', 'export=1',
+            admin_headers(django_user_model)
+        )
+        assert status == 200
+        assert [item['slug'] for item in json.loads(body)] == list(
+            Category.objects.values_list('slug', flat=True)
+        ), 'Проверьте, что выгрузка ?export=1 работает через ASGI'
+
+    def test_streaming_csv_export(self, api_client, make_catalogue,
+                                  django_user_model, tmp_path):
+        from django.core.management import call_command
+        make_catalogue(3)
+        call_command('export_data_db', path=str(tmp_path), stdout=None)
+        status, body = asgi_get(
+            '/api/v1/export/review.csv/', '',
+            admin_headers(django_user_model)
+        )
+        assert status == 200
+        assert body.decode() == (tmp_path / 'review.csv').read_text(), (
+            'Проверьте, что выгрузка CSV работает через ASGI'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncConcurrency:
+
+    def test_slow_reads_do_not_wait_for_each_other(self, settings,
+                                                    monkeypatch):
+        from rest_framework.response import Response
+
+        from api.views import CategoryViewSet
+        from api_yamdb.asgi import YamdbASGIHandler
+
+        settings.QUERY_INSPECTOR_ENABLED = True
+
+        def slow_list(self, request, *args, **kwargs):
+            time.sleep(0.5)
+            return Response([])
+
+        monkeypatch.setattr(CategoryViewSet, 'list', slow_list)
+        # Промежуточные слои загружаются при создании обработчика.
+        application = YamdbASGIHandler()
+
+        async def get_all():
+            return await asyncio.gather(*(
+                asgi_request(application, '/api/v1/categories/')
+                for _ in range(4)
+            ))
+
+        start = time.perf_counter()
+        responses = async_to_sync(get_all)()
+        elapsed = time.perf_counter() - start
+        assert [status for status, _ in responses] == [200] * 4
+        assert elapsed < 1.0, (
+            'Проверьте, что промежуточные слои не выполняют запросы '
+            f'по очереди под ASGI: 4 запроса по 0.5 с заняли {elapsed:.2f} с'
+        )
+
+    @pytest.mark.allow_n_plus_one
+    def test_query_inspector_sees_view_queries(self, settings,
+                                               make_catalogue, monkeypatch):
+        from api.query_inspector import queries_inspected
+        from api.views import TitleViewSet
+        from api_yamdb.asgi import YamdbASGIHandler
+        from reviews.models import Title
+
+        make_catalogue(6)
+        settings.QUERY_INSPECTOR_ENABLED = True
+        monkeypatch.setattr(TitleViewSet, 'queryset', Title.objects.all())
+        reports = []
+
+        def collect(sender, report, **kwargs):
+            reports.append(report)
+
+        queries_inspected.connect(collect)
+        try:
+            status, _ = async_to_sync(asgi_request)(
+                YamdbASGIHandler(), '/api/v1/titles/'
+            )
+        finally:
+            queries_inspected.disconnect(collect)
+        assert status == 200
+        [report] = reports
+        assert report.repeated, (
+            'Проверьте, что под ASGI в отчет попадают запросы '
+            'представления из других потоков'
+        )
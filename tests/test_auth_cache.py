@@ -0,0 +1,75 @@
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user_client(api_client, django_user_model):
+    user = django_user_model.objects.create(
+        username='reader', email='reader@yamdb.fake', bio='Читатель'
+    )
+    api_client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+    )
+    return api_client, user
+
+
+class TestCachedAuthentication:
+
+    def test_user_not_queried_on_repeated_requests(
+            self, user_client, django_assert_num_queries):
+        client, user = user_client
+        client.get('/api/v1/categories/')
+        with django_assert_num_queries(0):
+            client.get('/api/v1/categories/')
+        response = client.get('/api/v1/users/me/')
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что /users/me/ возвращает полный профиль'
+        )
+
+    def test_role_change_applies_immediately(self, user_client):
+        from django.conf import settings
+        client, user = user_client
+        url = '/api/v1/categories/'
+        data = {'name': 'Музыка', 'slug': 'music'}
+        assert client.post(url, data).status_code == 403
+        user.role = settings.ROLE_ADMIN
+        user.save()
+        assert client.post(url, data).status_code == 201, (
+            'Проверьте, что смена роли сбрасывает кеш аутентификации'
+        )
+        user.is_active = False
+        user.save()
+        assert client.get(url).status_code == 401, (
+            'Проверьте, что заблокированный пользователь не проходит '
+            'аутентификацию'
+        )
+
+    def test_cached_user_save_keeps_other_fields(self, user_client):
+        from api.authentication import CachedJWTAuthentication
+        _, user = user_client
+        authentication = CachedJWTAuthentication()
+        token = authentication.get_validated_token(
+            str(AccessToken.for_user(user))
+        )
+        authentication.get_user(token)
+        cached = authentication.get_user(token)
+        assert cached.get_deferred_fields(), (
+            'Проверьте, что пользователь берется из кеша'
+        )
+        cached.first_name = 'Имя'
+        cached.save()
+        user.refresh_from_db()
+        assert (user.first_name, user.email, user.bio) == (
+            'Имя', 'reader@yamdb.fake', 'Читатель'
+        ), 'save() пользователя из кеша не должен затирать остальные поля'
+
+    def test_local_cache_not_used(self, user_client, settings,
+                                  django_assert_num_queries):
+        client, _ = user_client
+        settings.API_CACHE_SHARED = False
+        client.get('/api/v1/categories/')
+        # Пользователь и число категорий.
+        with django_assert_num_queries(2):
+            client.get('/api/v1/categories/')
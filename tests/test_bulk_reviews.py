@@ -0,0 +1,145 @@
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+pytestmark = pytest.mark.django_db
+
+URL = '/api/v1/titles/reviews/bulk/'
+
+
+@pytest.fixture
+def partner_client(api_client, django_user_model):
+    partner = django_user_model.objects.create(
+        username='partner', email='partner@yamdb.fake'
+    )
+    api_client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(partner)}'
+    )
+    return api_client, partner
+
+
+class TestBulkReviews:
+
+    def test_all_created(self, partner_client, make_catalogue,
+                         django_assert_max_num_queries):
+        from reviews.models import Title
+        client, _ = partner_client
+        titles, _ = make_catalogue(3)
+        data = [
+            {'title_id': title.id, 'text': 'Отзыв', 'score': score}
+            for title, score in zip(titles, (3, 6, 9))
+        ]
+        # Пользователь, точка сохранения, две проверки, вставка, id
+        # вставленных строк (SQLite), ее освобождение и по обновлению
+        # рейтинга на произведение.
+        with django_assert_max_num_queries(7 + len(titles)):
+            response = client.post(URL, data, format='json')
+        assert response.status_code == 201
+        assert [item['status'] for item in response.json()] == [201] * 3
+        for title, item in zip(titles, data):
+            title = Title.objects.get(pk=title.pk)
+            reviews = title.reviews.all()
+            assert title.rating_sum == sum(r.score for r in reviews), (
+                'Проверьте, что рейтинг обновлен для каждого произведения'
+            )
+            assert title.rating_count == len(reviews)
+
+    def test_partial_success(self, partner_client, make_catalogue):
+        from reviews.models import Review
+        client, partner = partner_client
+        titles, _ = make_catalogue(2)
+        Review.objects.create(
+            title=titles[1], author=partner, text='Уже есть', score=5
+        )
+        response = client.post(URL, [
+            {'title_id': titles[0].id, 'text': 'Новый', 'score': 7},
+            {'title_id': titles[0].id, 'text': 'Повтор', 'score': 7},
+            {'title_id': titles[1].id, 'text': 'Повтор', 'score': 7},
+            {'title_id': 999, 'text': 'Нет такого', 'score': 7},
+            {'title_id': titles[0].id, 'text': 'Оценка', 'score': 11},
+        ], format='json')
+        assert response.status_code == 207
+        results = response.json()
+        assert [item['status'] for item in results] == [
+            201, 400, 400, 400, 400
+        ], 'Проверьте результаты по каждому элементу'
+        assert results[0]['review']['author'] == 'partner'
+        assert Review.objects.filter(author=partner).count() == 2
+
+    def test_retry_after_conflict_rechecks_items(
+            self, partner_client, make_catalogue, monkeypatch):
+        from django.db import IntegrityError
+
+        from api.views import ReviewBulkCreateAPIView
+        from reviews.models import CatalogueQuerySet, Review
+        client, partner = partner_client
+        titles, _ = make_catalogue(2)
+        existing = Review.objects.create(
+            title=titles[1], author=partner, text='Старый', score=1
+        )
+        create_reviews = ReviewBulkCreateAPIView.create_reviews
+
+        def conflict(*args, **kwargs):
+            raise IntegrityError
+
+        def create_after_conflict(self, *args):
+            monkeypatch.setattr(
+                ReviewBulkCreateAPIView, 'create_reviews', create_reviews
+            )
+            with monkeypatch.context() as patch:
+                patch.setattr(CatalogueQuerySet, 'bulk_create', conflict)
+                with pytest.raises(IntegrityError):
+                    create_reviews(self, *args)
+            # Между попытками другой запрос удалил старый отзыв.
+            existing.delete()
+            raise IntegrityError
+
+        monkeypatch.setattr(
+            ReviewBulkCreateAPIView, 'create_reviews', create_after_conflict
+        )
+        response = client.post(URL, [
+            {'title_id': title.id, 'text': 'Отзыв', 'score': 5}
+            for title in titles
+        ], format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что повтор не использует ошибки прошлой попытки'
+        )
+        assert [item['status'] for item in response.json()] == [201, 201]
+
+    def test_repeated_conflict_is_item_error(
+            self, partner_client, make_catalogue, monkeypatch):
+        from django.db import IntegrityError
+
+        from api.views import ReviewBulkCreateAPIView
+        from reviews.models import Review
+        client, partner = partner_client
+        titles, _ = make_catalogue(2)
+        create_reviews = ReviewBulkCreateAPIView.create_reviews
+
+        def conflict_on_second_title(self, valid, invalid):
+            # Отзыв на второе произведение создается другим запросом при
+            # каждой попытке.
+            if any(data['title_id'] == titles[1].id
+                   for data in valid.values()):
+                raise IntegrityError
+            return create_reviews(self, valid, invalid)
+
+        monkeypatch.setattr(
+            ReviewBulkCreateAPIView, 'create_reviews',
+            conflict_on_second_title
+        )
+        response = client.post(URL, [
+            {'title_id': title.id, 'text': 'Отзыв', 'score': 5}
+            for title in titles
+        ], format='json')
+        assert response.status_code == 207, (
+            'Проверьте, что повторный конфликт не приводит к ошибке 500'
+        )
+        results = response.json()
+        assert [item['status'] for item in results] == [201, 400]
+        assert 'non_field_errors' in results[1]['errors']
+        assert Review.objects.filter(author=partner).count() == 1
+
+    def test_rejects_non_list(self, partner_client):
+        client, _ = partner_client
+        response = client.post(URL, {'title_id': 1}, format='json')
+        assert response.status_code == 400
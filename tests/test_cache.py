@@ -0,0 +1,118 @@
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCatalogueCache:
+
+    def test_repeated_list_served_from_cache(
+            self, api_client, make_catalogue, django_assert_num_queries):
+        make_catalogue(3)
+        first = api_client.get('/api/v1/titles/')
+        with django_assert_num_queries(0):
+            second = api_client.get('/api/v1/titles/')
+        assert first.json() == second.json(), (
+            'Проверьте, что из кеша возвращаются те же данные'
+        )
+
+    def test_cache_invalidated_on_write(self, api_client, make_catalogue):
+        from reviews.models import Genre
+        titles, _ = make_catalogue(1)
+        url = f'/api/v1/titles/{titles[0].id}/'
+        api_client.get(url)
+        Genre.objects.filter(slug='drama').update(name='Не сигнал')
+        Genre.objects.get(slug='comedy').delete()
+        response = api_client.get(url)
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            'drama'
+        ], 'Проверьте, что изменение жанра сбрасывает кеш произведений'
+
+    def test_conditional_get(self, api_client, make_catalogue,
+                             django_assert_num_queries):
+        make_catalogue(1)
+        response = api_client.get('/api/v1/categories/')
+        etag = response['ETag']
+        with django_assert_num_queries(0):
+            response = api_client.get(
+                '/api/v1/categories/', HTTP_IF_NONE_MATCH=etag
+            )
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении ETag возвращается 304'
+        )
+
+
+class TestConditionalReviewsComments:
+
+    def test_unchanged_reviews_not_modified(
+            self, api_client, make_catalogue, django_assert_num_queries):
+        titles, _ = make_catalogue(3)
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        etag = api_client.get(url)['ETag']
+        with django_assert_num_queries(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что неизмененный список отзывов отдает 304'
+        )
+
+    def test_edited_comment_changes_etag(self, api_client, make_catalogue):
+        titles, reviews = make_catalogue(3)
+        url = (
+            f'/api/v1/titles/{titles[0].id}/reviews/'
+            f'{reviews[0].id}/comments/'
+        )
+        etag = api_client.get(url)['ETag']
+        comment = reviews[0].comments.first()
+        comment.text = 'Исправленный комментарий'
+        comment.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что изменение комментария меняет ETag списка'
+        )
+
+    def test_renamed_author_changes_etag(self, api_client, make_catalogue,
+                                         django_assert_num_queries):
+        titles, reviews = make_catalogue(3)
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        etag = api_client.get(url)['ETag']
+        author = reviews[0].author
+        author.bio = 'Не влияет на список'
+        author.save()
+        with django_assert_num_queries(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        author.username = 'renamed'
+        author.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что смена имени автора меняет ETag списка отзывов'
+        )
+        assert 'renamed' in [item['author'] for item in response.json()[
+            'results'
+        ]]
+
+
+class TestSharedCache:
+
+    def test_local_cache_disables_caching(
+            self, api_client, settings, make_catalogue,
+            django_assert_num_queries):
+        titles, _ = make_catalogue(1)
+        settings.API_CACHE_SHARED = False
+        response = api_client.get('/api/v1/categories/')
+        assert 'ETag' not in response, (
+            'С локальным кешем процесса ответ не должен получать ETag'
+        )
+        with django_assert_num_queries(2):
+            api_client.get('/api/v1/categories/')
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        assert 'ETag' not in api_client.get(url)
+
+    def test_queryset_update_invalidates(self, api_client, make_catalogue):
+        from reviews.models import Title
+        titles, _ = make_catalogue(1)
+        url = f'/api/v1/titles/{titles[0].id}/'
+        api_client.get(url)
+        Title.objects.filter(pk=titles[0].pk).update(name='Новое название')
+        assert api_client.get(url).json()['name'] == 'Новое название', (
+            'Проверьте, что QuerySet.update() сбрасывает кеш ответов'
+        )
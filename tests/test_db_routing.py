@@ -0,0 +1,236 @@
+import threading
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@pytest.fixture
+def replica(settings):
+    """Второй алиас на ту же тестовую базу, как реплика с TEST MIRROR."""
+    connections.databases['replica'] = dict(
+        connections['default'].settings_dict
+    )
+    settings.DATABASE_REPLICAS = ['replica']
+    yield connections['replica']
+    connections['replica'].close()
+    del connections['replica']
+    del connections.databases['replica']
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+
+    def test_safe_requests_read_from_replica(self, api_client, replica,
+                                             make_catalogue):
+        titles, _ = make_catalogue(2)
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(replica) as secondary:
+            response = api_client.get(
+                f'/api/v1/titles/{titles[0].id}/reviews/'
+            )
+        assert response.status_code == 200
+        assert secondary.captured_queries and not primary.captured_queries, (
+            'Проверьте, что запросы на чтение к API идут в реплику'
+        )
+
+    def test_writes_and_other_code_use_default(self, api_client, admin_user,
+                                               replica):
+        from reviews.models import Category
+
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin_user)}'
+        )
+        with CaptureQueriesContext(replica) as secondary:
+            response = api_client.post(
+                '/api/v1/categories/', {'name': 'Книга', 'slug': 'book'}
+            )
+            Category.objects.get(slug='book')
+        assert response.status_code == 201
+        assert not secondary.captured_queries, (
+            'Проверьте, что запись и код вне запросов на чтение '
+            'используют основную базу'
+        )
+
+
+@pytest.mark.django_db
+def test_unusable_connection_is_closed(monkeypatch, settings):
+    from api.db import check_connections
+
+    settings.DB_HEALTH_CHECK_INTERVAL = 0
+    connection = connections['default']
+    connection.ensure_connection()
+    monkeypatch.setattr(connection, 'is_usable', lambda: False)
+    monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+    closed = []
+    check_connections()
+    assert closed, 'Проверьте, что неработающее соединение закрывается'
+    settings.DB_HEALTH_CHECKS = False
+    closed.clear()
+    check_connections()
+    assert not closed
+
+
+@pytest.mark.django_db
+def test_recently_used_connection_is_not_checked(monkeypatch, settings):
+    from api.db import check_connections, mark_connections_used
+
+    connection = connections['default']
+    connection.ensure_connection()
+    checks = []
+    monkeypatch.setattr(
+        connection, 'is_usable', lambda: checks.append(True) or True
+    )
+    settings.DB_HEALTH_CHECK_INTERVAL = 60
+    mark_connections_used()
+    check_connections()
+    assert not checks, (
+        'Проверьте, что недавно работавшее соединение не проверяется '
+        'в каждом запросе'
+    )
+    settings.DB_HEALTH_CHECK_INTERVAL = 0
+    check_connections()
+    assert checks, (
+        'Проверьте, что соединение проверяется после '
+        'DB_HEALTH_CHECK_INTERVAL секунд простоя'
+    )
+
+
+@pytest.fixture
+def pooled(settings):
+    """Алиас на тестовую базу через пул соединений на одно соединение."""
+    from api_yamdb.postgresql_pool import base
+
+    if connections['default'].vendor != 'postgresql':
+        pytest.skip('Пул соединений работает только с PostgreSQL')
+    connections.databases['pooled'] = dict(
+        connections['default'].settings_dict,
+        ENGINE='api_yamdb.postgresql_pool',
+        POOL_SIZE=1, POOL_MAX=1, POOL_TIMEOUT=0.5,
+    )
+    settings.DB_HEALTH_CHECK_INTERVAL = 0
+    yield connections['pooled']
+    connections['pooled'].close()
+    del connections['pooled']
+    del connections.databases['pooled']
+    _, pool = base.pools.pop('pooled')
+    pool.closeall()
+
+
+@pytest.mark.django_db
+class TestConnectionPool:
+
+    def test_connection_is_reused(self, pooled):
+        pooled.ensure_connection()
+        raw = pooled.connection
+        pooled.close()
+        pooled.ensure_connection()
+        assert pooled.connection is raw, (
+            'Проверьте, что закрытое соединение возвращается в пул и '
+            'выдается снова'
+        )
+
+    def test_dead_connection_is_replaced(self, pooled):
+        pooled.ensure_connection()
+        raw = pooled.connection
+        pooled.close()
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_terminate_backend(%s)', [raw.get_backend_pid()]
+            )
+        pooled.ensure_connection()
+        assert pooled.connection is not raw
+        with pooled.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            assert cursor.fetchone() == (1,), (
+                'Проверьте, что оборванное соединение из пула заменяется '
+                'новым'
+            )
+
+    def test_waits_for_free_connection(self, pooled):
+        from psycopg2.pool import PoolError
+
+        pool = pooled.get_pool(pooled.get_connection_params())
+        raw = pool.getconn()
+        with pytest.raises(PoolError):
+            pool.getconn()
+        threading.Timer(0.1, pool.putconn, [raw]).start()
+        assert pool.getconn() is raw, (
+            'Проверьте, что при POOL_MAX выданных соединениях пул ждет '
+            'возврата соединения, а не падает'
+        )
+        pool.putconn(raw)
+
+
+def auth(client, user):
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCatalogueRouting:
+
+    def test_users_are_read_from_default(self, api_client, replica,
+                                         django_user_model):
+        user = django_user_model.objects.create(
+            username='reader', email='reader@yamdb.fake'
+        )
+        auth(api_client, user)
+        with CaptureQueriesContext(replica) as secondary:
+            response = api_client.get('/api/v1/users/me/')
+        assert response.status_code == 200
+        assert not secondary.captured_queries, (
+            'Проверьте, что пользователи читаются из основной базы'
+        )
+
+    def test_reads_stick_to_default_after_write(self, replica,
+                                                make_catalogue,
+                                                django_user_model):
+        from rest_framework.test import APIClient
+
+        titles, _ = make_catalogue(1)
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        writer, reader = APIClient(), APIClient()
+        auth(writer, django_user_model.objects.create(
+            username='writer', email='writer@yamdb.fake'
+        ))
+        auth(reader, django_user_model.objects.create(
+            username='other', email='other@yamdb.fake'
+        ))
+        response = writer.post(url, {'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 201
+        with CaptureQueriesContext(replica) as secondary:
+            assert len(writer.get(url).json()['results']) == 2
+        assert not secondary.captured_queries, (
+            'Проверьте, что после записи клиент читает из основной базы'
+        )
+        with CaptureQueriesContext(replica) as secondary:
+            reader.get(url)
+        assert secondary.captured_queries, (
+            'Проверьте, что другие клиенты продолжают читать из реплики'
+        )
+
+    def test_replicas_need_shared_cache(self, api_client, replica,
+                                        settings, make_catalogue):
+        titles, _ = make_catalogue(1)
+        settings.API_CACHE_SHARED = False
+        with CaptureQueriesContext(replica) as secondary:
+            api_client.get(f'/api/v1/titles/{titles[0].id}/reviews/')
+        assert not secondary.captured_queries, (
+            'Проверьте, что без общего кеша чтение не уходит в реплики: '
+            'отметку о записи клиента не увидят другие процессы'
+        )
+
+    def test_lagging_replica_is_skipped(self, api_client, replica,
+                                        monkeypatch, make_catalogue):
+        from reviews import routers
+
+        titles, _ = make_catalogue(1)
+        monkeypatch.setattr(routers, 'get_replica_lag', lambda alias: 60)
+        with CaptureQueriesContext(replica) as secondary:
+            api_client.get(f'/api/v1/titles/{titles[0].id}/reviews/')
+        assert not secondary.captured_queries, (
+            'Проверьте, что отстающая реплика не используется'
+        )
@@ -0,0 +1,59 @@
+import pytest
+from django.core import mail
+
+pytestmark = pytest.mark.django_db
+
+
+class TestEmailOutbox:
+
+    def test_signup_enqueues_email(self, api_client):
+        from reviews.models import OutgoingEmail
+        response = api_client.post(
+            '/api/v1/auth/signup/',
+            data={'username': 'newbie', 'email': 'newbie@yamdb.fake'}
+        )
+        assert response.status_code == 200
+        assert not mail.outbox, (
+            'Проверьте, что письмо не отправляется во время запроса'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'newbie@yamdb.fake'
+
+    def test_batch_sent_over_one_connection(self, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from api.mail import drain, enqueue_email
+        from reviews.models import OutgoingEmail
+        opened = []
+        monkeypatch.setattr(
+            EmailBackend, 'open', lambda self: opened.append(self)
+        )
+        for index in range(3):
+            enqueue_email(f'user{index}@yamdb.fake', 'Тема', 'Текст')
+        assert drain() == 3
+        assert len(mail.outbox) == 3
+        assert len(opened) == 1, (
+            'Проверьте, что пачка писем отправляется через одно соединение'
+        )
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_failed_email_retried_with_backoff(self, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from api.mail import drain, enqueue_email
+        from reviews.models import OutgoingEmail
+        send_messages = EmailBackend.send_messages
+
+        def fail(self, messages):
+            raise ConnectionError('SMTP недоступен')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        email = enqueue_email('user@yamdb.fake', 'Тема', 'Текст')
+        assert drain() == 1
+        email.refresh_from_db()
+        assert email.sent_at is None and email.attempts == 1
+        assert drain() == 0, (
+            'Проверьте, что повторная попытка откладывается'
+        )
+        monkeypatch.setattr(EmailBackend, 'send_messages', send_messages)
+        OutgoingEmail.objects.update(send_after=email.created)
+        assert drain() == 1
+        assert len(mail.outbox) == 1
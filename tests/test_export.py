@@ -0,0 +1,67 @@
+import gzip
+
+import pytest
+from django.core.management import CommandError, call_command
+
+pytestmark = pytest.mark.django_db
+
+
+def snapshot():
+    from api.export import EXPORT_COLUMNS
+    from api.csv_schema import FILE_NAMES_MODELS, get_column_field
+    result = {}
+    for file_name, columns in EXPORT_COLUMNS.items():
+        model = FILE_NAMES_MODELS[file_name]
+        attnames = [
+            get_column_field(model, column).attname for column in columns
+        ]
+        result[file_name] = list(
+            model.objects.order_by('pk').values_list(*attnames)
+        )
+    return result
+
+
+class TestExport:
+
+    def test_round_trip_through_importer(self, tmp_path, monkeypatch,
+                                         make_catalogue):
+        from api.management.commands import load_data_db
+        from reviews.models import Category, Genre, Title, User
+        make_catalogue(3)
+        Title.objects.create(
+            name='Без категории', year=1999, description='"Кавычки",\nи строки'
+        )
+        expected = snapshot()
+        call_command('export_data_db', path=str(tmp_path), stdout=None)
+        for model in (Title, Genre, Category, User):
+            model.objects.all().delete()
+        monkeypatch.setattr(load_data_db, 'FILES_DIR', str(tmp_path))
+        call_command('load_data_db', bulk=True)
+        assert snapshot() == expected, (
+            'Проверьте, что выгрузка загружается обратно без потерь'
+        )
+
+    def test_gzip_endpoint(self, tmp_path, api_client, django_user_model,
+                           make_catalogue):
+        from rest_framework_simplejwt.tokens import AccessToken
+        make_catalogue(2)
+        admin = django_user_model.objects.create(
+            username='admin', email='admin@yamdb.fake', role='admin'
+        )
+        url = '/api/v1/export/review.csv/'
+        assert api_client.get(url).status_code == 401
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}'
+        )
+        response = api_client.get(url, {'gzip': 1})
+        assert response.status_code == 200
+        call_command('export_data_db', path=str(tmp_path), stdout=None)
+        assert gzip.decompress(
+            b''.join(response.streaming_content)
+        ).decode() == (tmp_path / 'review.csv').read_text(), (
+            'Проверьте, что эндпойнт отдает тот же CSV, что и команда'
+        )
+
+    def test_path_is_required(self):
+        with pytest.raises(CommandError):
+            call_command('export_data_db', stdout=None)
@@ -0,0 +1,78 @@
+import pytest
+
+
+def counts(model):
+    return dict(model.objects.values_list('slug', 'title_count'))
+
+
+@pytest.mark.django_db
+class TestTitleCounts:
+
+    def test_counts_follow_changes(self, make_catalogue, genres):
+        from reviews.aggregates import rebuild_facets
+        from reviews.models import Category, Genre, Title
+
+        titles, _ = make_catalogue(3)
+        assert counts(Category) == {'movie': 3}
+        assert counts(Genre) == {'drama': 3, 'comedy': 3}, (
+            'Проверьте, что title.genre.set() увеличивает счетчики жанров'
+        )
+        book = Category.objects.create(name='Книга', slug='book')
+        title = Title.objects.get(pk=titles[0].pk)
+        title.category = book
+        title.save()
+        titles[1].genre.remove(genres[0])
+        genres[1].titles.add(Title.objects.create(name='Новое', year=2000))
+        titles[2].delete()
+        assert counts(Category) == {'movie': 1, 'book': 1}, (
+            'Проверьте пересчет категорий при смене и удалении'
+        )
+        assert counts(Genre) == {'drama': 1, 'comedy': 3}, (
+            'Проверьте пересчет жанров при remove, add и удалении'
+        )
+        expected = counts(Category), counts(Genre)
+        Category.objects.update(title_count=0)
+        Genre.objects.update(title_count=0)
+        rebuild_facets()
+        assert (counts(Category), counts(Genre)) == expected, (
+            'Проверьте, что rebuild_facets() дает те же счетчики'
+        )
+
+
+@pytest.mark.django_db
+class TestFacetsResponse:
+
+    def test_unfiltered_facets(self, api_client, make_catalogue,
+                               django_assert_max_num_queries):
+        make_catalogue(3)
+        with django_assert_max_num_queries(5):
+            response = api_client.get('/api/v1/titles/?facets=1')
+        assert response.json()['facets'] == {
+            'genre': [
+                {'slug': 'drama', 'name': 'Драма', 'count': 3},
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 3},
+            ],
+            'category': [{'slug': 'movie', 'name': 'Фильм', 'count': 3}],
+        }
+        assert 'facets' not in api_client.get('/api/v1/titles/').json(), (
+            'Счетчики должны добавляться только по параметру facets'
+        )
+
+    def test_filtered_facets(self, api_client, make_catalogue, genres,
+                             django_assert_max_num_queries):
+        from reviews.models import Title
+
+        titles, _ = make_catalogue(5)
+        Title.objects.create(name='Без жанра', year=1990)
+        titles[0].genre.remove(genres[1])
+        with django_assert_max_num_queries(5):
+            response = api_client.get(
+                '/api/v1/titles/?facets=1&genre=drama&year=2000'
+            )
+        assert response.json()['facets'] == {
+            'genre': [
+                {'slug': 'drama', 'name': 'Драма', 'count': 5},
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 4},
+            ],
+            'category': [{'slug': 'movie', 'name': 'Фильм', 'count': 5}],
+        }, 'Проверьте счетчики по отфильтрованным произведениям'
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def planner_prefers_indexes():
+    """На маленьких тестовых таблицах PostgreSQL выбирает seq scan,
+    поэтому для проверки плана он отключается."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+
+def assert_uses_index(queryset, index_name):
+    plan = queryset.explain()
+    assert index_name in plan, (
+        f'Проверьте, что запрос использует индекс {index_name}:\n{plan}'
+    )
+
+
+@pytest.mark.usefixtures('planner_prefers_indexes')
+class TestIndexes:
+
+    def test_reviews_by_title(self, make_catalogue):
+        from reviews.models import Review
+        titles, _ = make_catalogue(3)
+        assert_uses_index(
+            Review.objects.filter(title=titles[0]).order_by('-pub_date')[:10],
+            'review_title_pub_date_idx'
+        )
+
+    def test_comments_by_review(self, make_catalogue):
+        from reviews.models import Comment
+        _, reviews = make_catalogue(3)
+        assert_uses_index(
+            Comment.objects.filter(
+                review=reviews[0]
+            ).order_by('-pub_date')[:10],
+            'comment_review_pub_date_idx'
+        )
+
+    def test_titles_by_year(self, make_catalogue):
+        from reviews.models import Title
+        make_catalogue(3)
+        assert_uses_index(
+            Title.objects.filter(year=2000), 'title_year_idx'
+        )
+
+    def test_titles_by_name(self, make_catalogue):
+        from reviews.models import Title
+        make_catalogue(3)
+        assert_uses_index(
+            Title.objects.order_by('name', 'id')[:10], 'title_name_id_idx'
+        )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'postgresql',
+        reason='Триграммный индекс есть только в PostgreSQL'
+    )
+    def test_titles_name_icontains(self, make_catalogue):
+        from reviews.models import Title
+        make_catalogue(3)
+        assert_uses_index(
+            Title.objects.filter(name__icontains='изведен'),
+            'title_name_trgm_idx'
+        )
@@ -0,0 +1,351 @@
+import datetime as dt
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.core.management.base import OutputWrapper
+from django.db import connection
+
+pytestmark = pytest.mark.django_db
+
+PUB_DATE = '2019-09-24T21:08:21.567000+00:00'
+FILES = {
+    'category.csv': [
+        'id,name,slug',
+        '1,Фильм,movie',
+        '2,Книга,book',
+    ],
+    'genre.csv': [
+        'id,name,slug',
+        '1,Драма,drama',
+        '2,Комедия,comedy',
+    ],
+    'users.csv': [
+        'id,username,email,role,bio,first_name,last_name',
+        '100,bingobongo,bingobongo@yamdb.fake,user,,,',
+        '101,capt_obvious,capt_obvious@yamdb.fake,admin,,Капитан,',
+        '102,faust,faust@yamdb.fake,moderator,,,',
+    ],
+    'titles.csv': [
+        'id,name,year,category',
+        '1,Побег из Шоушенка,1994,1',
+        '2,Крестный отец,1972,1',
+        '3,Без категории,2000,',
+    ],
+    'genre_title.csv': [
+        'id,title_id,genre_id',
+        '1,1,1',
+        '2,1,2',
+        '3,2,1',
+        '4,9,1',
+    ],
+    'review.csv': [
+        'id,title_id,text,author,score,pub_date',
+        f'1,1,Отлично,100,10,{PUB_DATE}',
+        f'2,1,"Неплохо, но\nдолго",101,6,{PUB_DATE}',
+        f'3,2,Шедевр,100,9,{PUB_DATE}',
+        f'4,2,Скучно,102,4,{PUB_DATE}',
+        f'5,3,Нет автора,999,5,{PUB_DATE}',
+    ],
+    'comments.csv': [
+        'id,review_id,text,author,pub_date',
+        f'1,1,Согласен,101,{PUB_DATE}',
+        f'2,3,Поддерживаю,102,{PUB_DATE}',
+    ],
+}
+
+
+def write_files(path, files):
+    for file_name, lines in files.items():
+        (path / file_name).write_text(
+            '\n'.join(lines) + '\n', encoding='utf-8'
+        )
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    from api.management.commands import load_data_db
+    write_files(tmp_path, FILES)
+    monkeypatch.setattr(load_data_db, 'FILES_DIR', str(tmp_path))
+    monkeypatch.setattr(
+        load_data_db, 'CHECKPOINTS_DIR', str(tmp_path / '.checkpoints')
+    )
+    return tmp_path
+
+
+def load(**options):
+    call_command('load_data_db', stdout=None, stderr=None, **options)
+
+
+def assert_loaded():
+    from reviews.models import Category, Comment, Review, Title, User
+
+    counts = {
+        model.__name__: model.objects.count()
+        for model in (Category, User, Title, Review, Comment)
+    }
+    assert counts == {
+        'Category': 2, 'User': 3, 'Title': 3, 'Review': 4, 'Comment': 2
+    }, 'Проверьте, что загружены все строки с существующими ключами'
+    first, second, third = Title.objects.order_by('pk')
+    assert first.category.slug == 'movie'
+    assert third.category is None
+    assert {genre.slug for genre in first.genre.all()} == {
+        'drama', 'comedy'
+    }, 'Проверьте загрузку связей произведений и жанров'
+    assert [genre.slug for genre in second.genre.all()] == ['drama']
+    assert (first.rating_sum, first.rating_count) == (16, 2), (
+        'Проверьте пересчет рейтинга после загрузки'
+    )
+    review = Review.objects.get(pk=2)
+    assert review.text == 'Неплохо, но\nдолго'
+    assert review.pub_date == dt.datetime(
+        2019, 9, 24, 21, 8, 21, 567000, tzinfo=dt.timezone.utc
+    ), 'Проверьте, что дата публикации берется из CSV'
+    assert User.objects.get(pk=101).first_name == 'Капитан'
+
+
+class TestBulkLoad:
+
+    def test_bulk_load(self, data_dir):
+        from reviews.models import Category, Review, Title, User
+
+        load(bulk=True, batch_size=2)
+        assert_loaded()
+        pub_date = Review._meta.get_field('pub_date')
+        assert pub_date.auto_now_add, (
+            'Загрузка не должна менять поля модели'
+        )
+        review = Review.objects.create(
+            title=Title.objects.get(pk=3), author=User.objects.get(pk=102),
+            text='Новый', score=7
+        )
+        assert review.pub_date.year > 2019
+        assert Category.objects.create(name='Музыка', slug='music').pk == 3, (
+            'Проверьте, что счетчики id сдвинуты после загрузки'
+        )
+
+    def test_bulk_skips_existing_ids(self, data_dir, capsys):
+        from reviews.models import Review
+
+        load(bulk=True)
+        load(bulk=True)
+        assert Review.objects.count() == 4
+        assert 'запись с id=1 уже существует' in capsys.readouterr().err
+
+    def test_upsert(self, data_dir, capsys):
+        from reviews.models import Review, Title
+
+        load(bulk=True)
+        files = dict(FILES)
+        files['review.csv'] = FILES['review.csv'][:]
+        files['review.csv'][1] = f'1,1,Изменено,100,8,{PUB_DATE}'
+        files['review.csv'].append(f'6,3,Новый,102,2,{PUB_DATE}')
+        write_files(data_dir, files)
+        capsys.readouterr()
+        load(upsert=True)
+        output = capsys.readouterr().out
+        assert 'review.csv: записано 2 строк (новых 1, обновлено 1)' in (
+            output
+        ), 'Проверьте, что обновляются только изменившиеся строки'
+        assert 'category.csv: записано 0 строк' in output
+        assert Review.objects.get(pk=1).text == 'Изменено'
+        assert Review.objects.count() == 5
+        title = Title.objects.get(pk=1)
+        assert (title.rating_sum, title.rating_count) == (14, 2)
+
+    def test_resume_after_failure(self, data_dir, monkeypatch):
+        from api.management.commands import load_data_db
+        from reviews.models import Review
+
+        flush = load_data_db.BulkLoader.flush
+        calls = []
+
+        def failing_flush(self, file_name, model, batch, fields):
+            if file_name == 'review.csv' and batch:
+                calls.append(len(batch))
+                if len(calls) == 2:
+                    raise RuntimeError('Обрыв соединения')
+            flush(self, file_name, model, batch, fields)
+
+        monkeypatch.setattr(load_data_db.BulkLoader, 'flush', failing_flush)
+        with pytest.raises(RuntimeError):
+            load(resume=True, batch_size=1)
+        assert Review.objects.count() == 1
+        checkpoints = data_dir / '.checkpoints'
+        assert (checkpoints / 'review.csv.json').exists()
+        monkeypatch.setattr(load_data_db.BulkLoader, 'flush', flush)
+        load(resume=True, batch_size=1)
+        assert_loaded()
+        assert not checkpoints.exists(), (
+            'Проверьте, что прогресс удаляется после успешной загрузки'
+        )
+
+
+class TestResume:
+
+    def test_failed_file_keeps_checkpoints(self, data_dir, monkeypatch):
+        from api.management.commands import load_data_db
+
+        load_file = load_data_db.BulkLoader.load_file
+
+        def failing_load_file(self, path, model, *args):
+            if path.endswith('comments.csv'):
+                self.failed = True
+                return 0, 1
+            return load_file(self, path, model, *args)
+
+        monkeypatch.setattr(
+            load_data_db.BulkLoader, 'load_file', failing_load_file
+        )
+        load(bulk=True, resume=True)
+        assert (data_dir / '.checkpoints' / 'review.csv.json').exists(), (
+            'Проверьте, что прогресс сохраняется, если файл не загружен'
+        )
+
+    def test_layout_kept_for_other_workers(self, data_dir):
+        from api.management.commands.load_data_db import (
+            Checkpoints, get_byte_ranges
+        )
+        checkpoints = Checkpoints(str(data_dir / '.checkpoints'))
+        path = str(data_dir / 'review.csv')
+        byte_ranges = get_byte_ranges(path, 3, checkpoints)
+        assert len(byte_ranges) == 3
+        assert get_byte_ranges(path, 2, checkpoints) == [
+            list(byte_range) for byte_range in byte_ranges
+        ], 'Проверьте, что при продолжении используется прежнее разбиение'
+        comments = str(data_dir / 'comments.csv')
+        checkpoints.save('comments.csv', 1)
+        assert get_byte_ranges(comments, 3, checkpoints) == [None]
+
+    def test_resume_parts_in_one_process(self, data_dir, capsys):
+        from api.csv_schema import FILE_NAMES_MODELS
+        from api.management.commands.load_data_db import (
+            BulkLoader, Checkpoints, get_byte_ranges, load_part
+        )
+        from reviews.models import Review
+
+        load(bulk=True)
+        Review.objects.all().delete()
+        checkpoints = Checkpoints(str(data_dir / '.checkpoints'))
+        path = str(data_dir / 'review.csv')
+        byte_ranges = get_byte_ranges(path, 3, checkpoints)
+        loader = BulkLoader(
+            1, OutputWrapper(io.StringIO()), OutputWrapper(io.StringIO()),
+            checkpoints=checkpoints
+        )
+        load_part(
+            loader, path, FILE_NAMES_MODELS['review.csv'], 0, 3,
+            byte_ranges[0]
+        )
+        capsys.readouterr()
+        load(bulk=True, resume=True, upsert=True)
+        output = capsys.readouterr()
+        assert 'review.csv [1/3]: уже загружен' in output.out
+        assert 'review.csv [2/3]: записано' in output.out
+        assert_loaded()
+
+
+class TestParallelLoad:
+
+    @pytest.mark.parametrize('chunk_count', [1, 2, 3, 10])
+    def test_split_csv(self, data_dir, chunk_count):
+        from api.management.commands.load_data_db import (
+            read_range, split_csv
+        )
+        path = data_dir / 'review.csv'
+        byte_ranges = split_csv(path, chunk_count)
+        assert 1 <= len(byte_ranges) <= chunk_count
+        text = ''.join(
+            line for byte_range in byte_ranges
+            for line in read_range(path, *byte_range)
+        )
+        assert text == '\n'.join(FILES['review.csv'][1:]) + '\n', (
+            'Проверьте, что части файла не пересекаются и покрывают его'
+        )
+        for start, _ in byte_ranges[1:]:
+            assert ''.join(
+                read_range(path, start, start + 1)
+            )[0].isdigit(), 'Часть не должна начинаться внутри записи'
+
+    def test_load_by_ranges(self, data_dir):
+        from api.csv_schema import FILE_NAMES_MODELS
+        from api.management.commands.load_data_db import (
+            BulkLoader, split_csv
+        )
+        from reviews.models import Review
+
+        load(bulk=True)
+        Review.objects.all().delete()
+        loader = BulkLoader(1, OutputWrapper(io.StringIO()),
+                            OutputWrapper(io.StringIO()))
+        path = str(data_dir / 'review.csv')
+        byte_ranges = split_csv(path, 3)
+        written = sum(
+            loader.load_file(
+                path, FILE_NAMES_MODELS['review.csv'], chunk,
+                len(byte_ranges), byte_range
+            )[0]
+            for chunk, byte_range in enumerate(byte_ranges)
+        )
+        assert written == Review.objects.count() == 4
+        assert Review.objects.get(pk=2).text == 'Неплохо, но\nдолго'
+
+    def test_workers_require_bulk(self, data_dir):
+        with pytest.raises(CommandError):
+            load(workers=2)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_parallel_load(self, data_dir):
+        if connection.vendor != 'postgresql':
+            pytest.skip('SQLite не поддерживает параллельную запись')
+        load(bulk=True, workers=3, batch_size=1)
+        assert_loaded()
+
+
+class TestCopyLoad:
+
+    @pytest.fixture(autouse=True)
+    def postgresql_only(self):
+        if connection.vendor != 'postgresql':
+            pytest.skip('COPY поддерживается только PostgreSQL')
+
+    def test_copy_load(self, data_dir):
+        load(copy=True)
+        assert_loaded()
+
+    def test_copy_upsert(self, data_dir):
+        from reviews.models import Review
+
+        load(copy=True)
+        files = dict(FILES)
+        files['review.csv'] = FILES['review.csv'][:]
+        files['review.csv'][1] = f'1,1,Изменено,100,8,{PUB_DATE}'
+        write_files(data_dir, files)
+        load(copy=True, upsert=True)
+        assert Review.objects.get(pk=1).text == 'Изменено'
+        assert Review.objects.count() == 4
+
+    def test_copy_upsert_skips_unique_conflicts(self, data_dir, capsys):
+        from reviews.models import Review, User
+
+        load(copy=True)
+        files = dict(FILES)
+        files['users.csv'] = FILES['users.csv'] + [
+            '103,faust,other@yamdb.fake,user,,,',
+            '104,newbie,newbie@yamdb.fake,user,,,',
+            '105,newbie,newbie2@yamdb.fake,user,,,',
+        ]
+        files['review.csv'] = FILES['review.csv'] + [
+            f'7,1,Повтор,100,3,{PUB_DATE}',
+        ]
+        write_files(data_dir, files)
+        load(copy=True, upsert=True)
+        assert 'users.csv: записано 1 строк' in capsys.readouterr().out, (
+            'Проверьте, что строки с занятым username пропускаются, '
+            'а не прерывают загрузку файла'
+        )
+        assert set(User.objects.values_list('pk', flat=True)) == {
+            100, 101, 102, 104
+        }
+        assert not Review.objects.filter(pk=7).exists()
@@ -0,0 +1,98 @@
+import re
+
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+METRICS_URL = '/api/v1/metrics/'
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    from api.metrics import registry
+    registry.clear()
+
+
+def sample(text, name, **labels):
+    for line in text.splitlines():
+        if line.startswith(name + '{') and all(
+                f'{key}="{value}"' in line for key, value in labels.items()):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_route_metrics_exported(self, api_client, admin_user,
+                                    make_catalogue):
+        make_catalogue(2)
+        for _ in range(3):
+            api_client.get('/api/v1/titles/?page_size=1')
+        api_client.get('/api/v1/missing/')
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin_user)}'
+        )
+        response = api_client.get(METRICS_URL)
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        route = {'route': 'titles-list', 'method': 'GET'}
+        assert sample(
+            text, 'yamdb_request_duration_seconds_count', **route
+        ) == 3, 'Проверьте, что запросы учитываются по имени маршрута'
+        assert sample(
+            text, 'yamdb_request_duration_seconds_bucket', le='+Inf', **route
+        ) == 3
+        assert sample(text, 'yamdb_requests_total', status='200', **route)
+        assert sample(text, 'yamdb_db_queries_total', **route) > 0, (
+            'Проверьте подсчет SQL-запросов'
+        )
+        for name in ('yamdb_serializer_seconds_total',
+                     'yamdb_render_seconds_total'):
+            assert sample(text, name, **route) > 0, (
+                f'Проверьте, что заполняется {name}'
+            )
+        assert sample(
+            text, 'yamdb_requests_total', route='unmatched', status='404'
+        ) == 1
+        assert re.search(r'^# TYPE yamdb_request_duration_seconds histogram$',
+                         text, re.M)
+
+    def test_metrics_for_admins_only(self, api_client, django_user_model):
+        assert api_client.get(METRICS_URL).status_code == 401
+        user = django_user_model.objects.create(
+            username='reader', email='reader@yamdb.fake'
+        )
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+        assert api_client.get(METRICS_URL).status_code == 403
+
+    def test_streaming_duration_covers_stream(self, api_client, admin_user,
+                                              make_catalogue):
+        from api.metrics import registry
+
+        make_catalogue(1)
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin_user)}'
+        )
+        response = api_client.get('/api/v1/categories/?export=1')
+        assert response.streaming
+        route = {'route': 'categories-list', 'method': 'GET'}
+        count = 'yamdb_request_duration_seconds_count'
+        assert sample(registry.export(), count, **route) is None, (
+            'Проверьте, что потоковый ответ замеряется до конца передачи'
+        )
+        b''.join(response.streaming_content)
+        assert sample(registry.export(), count, **route) == 1
+
+    def test_retrieve_serializer_time(self, api_client, make_catalogue):
+        from api.metrics import registry
+
+        titles, _ = make_catalogue(1)
+        response = api_client.get(f'/api/v1/titles/{titles[0].id}/')
+        assert response.status_code == 200
+        assert sample(
+            registry.export(), 'yamdb_serializer_seconds_total',
+            route='titles-detail', method='GET'
+        ) > 0, 'Проверьте замер сериализации в retrieve'
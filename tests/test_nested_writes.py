@@ -0,0 +1,70 @@
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def author_client(api_client, make_catalogue):
+    titles, reviews = make_catalogue(2)
+    review = reviews[0]
+    api_client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(review.author)}'
+    )
+    # Первый запрос кеширует пользователя аутентификации.
+    api_client.get('/api/v1/categories/')
+    return api_client, titles, review
+
+
+class TestNestedWriteQueries:
+
+    @pytest.mark.parametrize('method, path, data, queries', [
+        # Произведение, проверка уникальности, вставка, рейтинг.
+        ('post', 'titles/{title}/reviews/', {'text': 'Т', 'score': 4}, 4),
+        # Отзыв, обновление, рейтинг.
+        ('patch', 'titles/{title}/reviews/{review}/', {'score': 9}, 3),
+        # Отзыв с произведением, вставка.
+        ('post', 'titles/{title}/reviews/{review}/comments/',
+         {'text': 'К'}, 2),
+        # Комментарий, обновление.
+        ('patch', 'titles/{title}/reviews/{review}/comments/{comment}/',
+         {'text': 'К'}, 2),
+        # Комментарий, удаление.
+        ('delete', 'titles/{title}/reviews/{review}/comments/{comment}/',
+         None, 2),
+    ])
+    def test_write_queries(self, author_client, django_assert_num_queries,
+                           method, path, data, queries):
+        client, titles, review = author_client
+        if method == 'post' and path.endswith('reviews/'):
+            title = titles[1]
+        else:
+            title = titles[0]
+        url = '/api/v1/' + path.format(
+            title=title.id,
+            review=review.id,
+            comment=review.comments.filter(author=review.author).first().id,
+        )
+        with django_assert_num_queries(queries):
+            response = getattr(client, method)(url, data)
+        assert response.status_code < 300, response.content
+
+    def test_review_delete_queries(self, author_client,
+                                   django_assert_max_num_queries):
+        client, titles, review = author_client
+        url = f'/api/v1/titles/{titles[0].id}/reviews/{review.id}/'
+        # Отзыв, комментарии для каскада, два удаления, рейтинг.
+        with django_assert_max_num_queries(5):
+            response = client.delete(url)
+        assert response.status_code == 204
+
+    def test_review_of_other_title_not_found(self, author_client):
+        client, titles, review = author_client
+        base = f'/api/v1/titles/{titles[1].id}/reviews/{review.id}/'
+        assert client.get(base).status_code == 404
+        assert client.get(f'{base}comments/').status_code == 404, (
+            'Проверьте, что отзыв другого произведения не найден'
+        )
+        assert client.post(
+            f'{base}comments/', {'text': 'К'}
+        ).status_code == 404
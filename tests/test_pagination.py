@@ -0,0 +1,64 @@
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+def walk(client, url, link='next'):
+    """Обходит страницы по ссылкам next или previous."""
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data
+        pages.append([item['id'] for item in data['results']])
+        url = data[link]
+    return pages
+
+
+class TestCursorPagination:
+
+    def test_titles_with_equal_names(self, api_client, category):
+        from reviews.models import Title
+
+        for index in range(25):
+            Title.objects.create(
+                name='Одинаковое' if index % 5 else f'Произведение {index}',
+                year=2000, category=category
+            )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+        pages = walk(api_client, '/api/v1/titles/?pagination=cursor')
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert sum(pages, []) == expected, (
+            'Проверьте, что при совпадающих названиях курсор не теряет '
+            'и не повторяет произведения'
+        )
+        last = api_client.get(
+            '/api/v1/titles/?pagination=cursor'
+        ).json()['next']
+        last = api_client.get(last).json()['next']
+        back = walk(
+            api_client, api_client.get(last).json()['previous'], 'previous'
+        )
+        assert sum(reversed(back), []) == expected[:20], (
+            'Проверьте обход назад по ссылкам previous'
+        )
+
+    def test_reviews_with_equal_dates(self, api_client, make_catalogue):
+        from reviews.models import Review
+
+        titles, _ = make_catalogue(23)
+        reviews = Review.objects.filter(title=titles[0])
+        reviews.update(pub_date=reviews.first().pub_date)
+        expected = list(
+            reviews.order_by('-pub_date', '-id').values_list('id', flat=True)
+        )
+        pages = walk(
+            api_client,
+            f'/api/v1/titles/{titles[0].id}/reviews/?pagination=cursor'
+        )
+        assert sum(pages, []) == expected, (
+            'Проверьте курсор для отзывов с одинаковой датой публикации'
+        )
@@ -0,0 +1,57 @@
+import pytest
+
+OBJECT_COUNTS = (1, 5, 15)
+
+
+@pytest.mark.django_db
+class TestQueryCount:
+
+    @pytest.mark.parametrize('count', OBJECT_COUNTS)
+    def test_titles_list(self, api_client, make_catalogue,
+                         django_assert_max_num_queries, count):
+        make_catalogue(count)
+        with django_assert_max_num_queries(3):
+            response = api_client.get('/api/v1/titles/')
+        assert response.status_code == 200, (
+            'Проверьте, что список произведений доступен без токена'
+        )
+
+    @pytest.mark.parametrize('count', OBJECT_COUNTS)
+    def test_title_detail(self, api_client, make_catalogue,
+                          django_assert_max_num_queries, count):
+        titles, _ = make_catalogue(count)
+        with django_assert_max_num_queries(2):
+            response = api_client.get(f'/api/v1/titles/{titles[0].id}/')
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('count', OBJECT_COUNTS)
+    def test_categories_and_genres_list(self, api_client, make_catalogue,
+                                        django_assert_max_num_queries,
+                                        count):
+        make_catalogue(count)
+        for url in ('/api/v1/categories/', '/api/v1/genres/'):
+            with django_assert_max_num_queries(2):
+                response = api_client.get(url)
+            assert response.status_code == 200
+
+    @pytest.mark.parametrize('count', OBJECT_COUNTS)
+    def test_reviews_list(self, api_client, make_catalogue,
+                          django_assert_max_num_queries, count):
+        titles, _ = make_catalogue(count)
+        # Агрегат для ETag, произведение, COUNT и страница отзывов.
+        with django_assert_max_num_queries(4):
+            response = api_client.get(
+                f'/api/v1/titles/{titles[0].id}/reviews/'
+            )
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('count', OBJECT_COUNTS)
+    def test_comments_list(self, api_client, make_catalogue,
+                           django_assert_max_num_queries, count):
+        titles, reviews = make_catalogue(count)
+        with django_assert_max_num_queries(4):
+            response = api_client.get(
+                f'/api/v1/titles/{titles[0].id}/reviews/'
+                f'{reviews[0].id}/comments/'
+            )
+        assert response.status_code == 200
@@ -0,0 +1,76 @@
+import pytest
+
+from api.query_inspector import normalize_sql
+
+
+class TestNormalizeSql:
+
+    @pytest.mark.parametrize('first, second', [
+        ('SELECT * FROM "t" WHERE "t"."id" = 1',
+         'SELECT * FROM "t" WHERE "t"."id" = 25'),
+        ('SELECT * FROM "t" WHERE "t"."id" IN (%s, %s)',
+         'SELECT * FROM "t" WHERE "t"."id" IN (%s, %s, %s)'),
+        ("SELECT * FROM \"t\" WHERE \"t\".\"slug\" = 'a''b'",
+         "SELECT * FROM  \"t\"\nWHERE \"t\".\"slug\" = 'c'"),
+    ])
+    def test_same_structure(self, first, second):
+        assert normalize_sql(first) == normalize_sql(second), (
+            'Проверьте, что значения и длина IN не влияют на структуру'
+        )
+
+    def test_different_structure(self):
+        assert normalize_sql('SELECT "a" FROM "t1"') != normalize_sql(
+            'SELECT "a" FROM "t2"'
+        )
+
+
+@pytest.mark.django_db
+class TestQueryInspector:
+
+    @pytest.mark.allow_n_plus_one
+    def test_n_plus_one_detected_with_origin(self, api_client, settings,
+                                             make_catalogue, monkeypatch):
+        from api.query_inspector import queries_inspected
+        from api.views import TitleViewSet
+        from reviews.models import Title
+
+        make_catalogue(6)
+        settings.QUERY_INSPECTOR_ENABLED = True
+        # Регрессия: без select_related и prefetch_related категория и
+        # жанры загружаются для каждого произведения отдельно.
+        monkeypatch.setattr(TitleViewSet, 'queryset', Title.objects.all())
+        reports = []
+
+        def collect(sender, report, **kwargs):
+            reports.append(report)
+
+        queries_inspected.connect(collect)
+        try:
+            api_client.get('/api/v1/titles/')
+        finally:
+            queries_inspected.disconnect(collect)
+        [report] = reports
+        tables = {
+            table for pattern in report.repeated
+            for table in ('reviews_category', 'reviews_genre')
+            if f'FROM "{table}"' in pattern.sql
+        }
+        assert tables == {'reviews_category', 'reviews_genre'}, (
+            'Проверьте, что повторяющиеся запросы категорий и жанров '
+            'попадают в отчет'
+        )
+        assert all(
+            pattern.count == 6 and pattern.origin
+            for pattern in report.repeated
+        ), 'Проверьте число повторов и место вызова в отчете'
+
+    def test_clean_request_has_no_report(self, api_client, settings,
+                                         make_catalogue, caplog):
+        make_catalogue(6)
+        settings.QUERY_INSPECTOR_ENABLED = True
+        settings.QUERY_INSPECTOR_SLOW_MS = 10 ** 6
+        api_client.get('/api/v1/titles/')
+        assert not [
+            record for record in caplog.records
+            if record.name == 'api.queries'
+        ], 'В списке произведений не должно быть N+1'
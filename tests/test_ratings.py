@@ -0,0 +1,109 @@
+import pytest
+from django.core.management import call_command
+
+pytestmark = pytest.mark.django_db
+
+
+def rating(title):
+    title.refresh_from_db()
+    return title.rating_sum, title.rating_count
+
+
+@pytest.fixture
+def authors(django_user_model):
+    return [
+        django_user_model.objects.create(
+            username=f'critic{index}', email=f'critic{index}@yamdb.fake'
+        )
+        for index in range(3)
+    ]
+
+
+@pytest.fixture
+def titles(category):
+    from reviews.models import Title
+    return [
+        Title.objects.create(name=f'Фильм {index}', year=2000,
+                             category=category)
+        for index in range(2)
+    ]
+
+
+class TestRatingAggregates:
+
+    def test_create_edit_delete(self, titles, authors):
+        from reviews.models import Review
+
+        title = titles[0]
+        assert rating(title) == (0, 0)
+        assert title.rating is None
+        first = Review.objects.create(
+            title=title, author=authors[0], text='Отзыв', score=4
+        )
+        Review.objects.create(
+            title=title, author=authors[1], text='Отзыв', score=8
+        )
+        assert rating(title) == (12, 2), (
+            'Проверьте, что новый отзыв увеличивает сумму и количество'
+        )
+        assert title.rating == 6
+        first.score = 10
+        first.save()
+        assert rating(title) == (18, 2), (
+            'Проверьте, что изменение оценки сдвигает только сумму'
+        )
+        first.text = 'Другой текст'
+        first.save()
+        assert rating(title) == (18, 2)
+        first.delete()
+        assert rating(title) == (8, 1), (
+            'Проверьте, что удаление отзыва вычитает его оценку'
+        )
+
+    def test_review_loaded_partially_and_moved(self, titles, authors):
+        from reviews.models import Review
+
+        review = Review.objects.create(
+            title=titles[0], author=authors[0], text='Отзыв', score=5
+        )
+        partial = Review.objects.only('id', 'text').get(pk=review.pk)
+        partial.score = 9
+        partial.save()
+        assert rating(titles[0]) == (9, 1), (
+            'Проверьте пересчет, если оценка не была загружена'
+        )
+        review = Review.objects.get(pk=review.pk)
+        review.title = titles[1]
+        review.save()
+        assert rating(titles[0]) == (0, 0)
+        assert rating(titles[1]) == (9, 1), (
+            'Проверьте перенос оценки при смене произведения'
+        )
+
+    def test_title_cascade(self, titles, authors):
+        from reviews.models import Review, Title
+
+        for author in authors:
+            Review.objects.create(
+                title=titles[0], author=author, text='Отзыв', score=7
+            )
+        titles[0].delete()
+        assert not Review.objects.exists()
+        assert rating(titles[1]) == (0, 0)
+        assert Title.objects.count() == 1
+
+    def test_rebuild_command(self, titles, authors, capsys):
+        from reviews.models import Review, Title
+
+        for index, author in enumerate(authors):
+            Review.objects.create(
+                title=titles[index % 2], author=author, text='Отзыв',
+                score=index + 1
+            )
+        Title.objects.update(rating_sum=100, rating_count=100)
+        call_command('rebuild_aggregates')
+        assert rating(titles[0]) == (4, 2), (
+            'Проверьте, что rebuild_aggregates пересчитывает рейтинг'
+        )
+        assert rating(titles[1]) == (2, 1)
+        assert 'Пересчитан рейтинг произведений: 2' in capsys.readouterr().out
@@ -0,0 +1,57 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class TestFastJSONRenderer:
+
+    def test_output_matches_json_renderer(self):
+        from api.renderers import FastJSONRenderer
+        data = {
+            'text': 'Отзыв   с   разделителями',
+            'pub_date': datetime(2023, 1, 2, 3, 4, 5, 678901, timezone.utc),
+            'price': Decimal('1.50'),
+            'items': [1, 2.5, None, True],
+            1: 'ключ-число',
+        }
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(
+            data
+        ), 'Проверьте, что вывод совпадает с JSONRenderer'
+
+
+@pytest.mark.django_db
+class TestStreamingExport:
+
+    @pytest.fixture
+    def admin_client(self, api_client, django_user_model):
+        admin = django_user_model.objects.create(
+            username='admin', email='admin@yamdb.fake', role='admin'
+        )
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}'
+        )
+        return api_client
+
+    def test_users_exported_in_chunks(self, admin_client, settings,
+                                      django_user_model):
+        settings.API_EXPORT_CHUNK_SIZE = 2
+        for index in range(4):
+            django_user_model.objects.create(
+                username=f'user{index}', email=f'user{index}@yamdb.fake'
+            )
+        response = admin_client.get('/api/v1/users/?export=1')
+        assert response.streaming, 'Проверьте, что выгрузка отдается потоком'
+        users = json.loads(b''.join(response.streaming_content))
+        assert [user['username'] for user in users] == [
+            'admin', 'user0', 'user1', 'user2', 'user3'
+        ]
+
+    def test_export_requires_admin(self, api_client, category):
+        response = api_client.get('/api/v1/categories/?export=1')
+        assert response.status_code == 401, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
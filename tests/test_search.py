@@ -0,0 +1,132 @@
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def titles(category):
+    from reviews.models import Title
+    return [
+        Title.objects.create(
+            name='Тихий океан', year=2000, category=category,
+            description='Фильм о путешествии'
+        ),
+        Title.objects.create(
+            name='Путешествие', year=2001, category=category,
+            description='Долгое путешествие через океан'
+        ),
+        Title.objects.create(
+            name='Горы', year=2002, category=category, description='Снег'
+        ),
+    ]
+
+
+class TestTitleSearch:
+
+    @pytest.mark.parametrize('values', [False, True])
+    def test_ranked_by_relevance(self, api_client, settings, titles, values):
+        settings.API_VALUES_SERIALIZERS = values
+        response = api_client.get('/api/v1/titles/', {'search': 'океан'})
+        names = [title['name'] for title in response.json()['results']]
+        assert set(names) == {'Тихий океан', 'Путешествие'}, (
+            'Проверьте, что поиск находит слово в названии и описании'
+        )
+        assert names[0] == 'Тихий океан', (
+            'Проверьте, что совпадение в названии релевантнее'
+        )
+
+    def test_index_follows_writes(self, api_client, titles):
+        title = titles[2]
+        title.name = 'Пустыня'
+        title.save()
+        titles[0].delete()
+
+        def found(query):
+            response = api_client.get('/api/v1/titles/', {'search': query})
+            return [item['id'] for item in response.json()['results']]
+
+        assert found('пустыня') == [title.id]
+        assert found('горы') == [], (
+            'Проверьте, что индекс обновляется при изменении записи'
+        )
+        assert found('тихий') == []
+
+
+class TestReviewSearch:
+
+    def test_search_endpoint(self, api_client, make_catalogue):
+        from reviews.models import Review
+        titles, reviews = make_catalogue(3)
+        Review.objects.filter(pk=reviews[1].pk).update(
+            text='Неожиданная развязка сюжета'
+        )
+        response = api_client.get(
+            '/api/v1/reviews/search/', {'q': 'развязка'}
+        )
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [item['id'] for item in results] == [reviews[1].id]
+        assert results[0]['title'] == titles[0].id
+
+    def test_query_required(self, api_client):
+        response = api_client.get('/api/v1/reviews/search/')
+        assert response.status_code == 400
+
+
+class TestAdminSearch:
+
+    def test_title_admin_searches_category(self, rf, titles):
+        from django.contrib.admin.sites import site
+        from reviews.models import Category, Title
+
+        other = Title.objects.create(
+            name='Вальс', year=2003,
+            category=Category.objects.create(name='Музыка', slug='music')
+        )
+        model_admin = site._registry[Title]
+
+        def found(query):
+            queryset, _ = model_admin.get_search_results(
+                rf.get('/'), Title.objects.all(), query
+            )
+            return set(queryset.values_list('id', flat=True))
+
+        assert found('Музык') == {other.id}, (
+            'Проверьте поиск произведений по названию категории в админке'
+        )
+        assert found('океан') == {titles[0].id, titles[1].id}, (
+            'Проверьте полнотекстовый поиск по названию и описанию'
+        )
+
+    def test_admin_search_subquery_is_not_correlated(self, rf, titles):
+        from django.contrib.admin.sites import site
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Title
+
+        if connection.vendor != 'postgresql':
+            pytest.skip('Колонка search_vector есть только в PostgreSQL')
+        queryset, _ = site._registry[Title].get_search_results(
+            rf.get('/'), Title.objects.all(), 'океан'
+        )
+        with CaptureQueriesContext(connection) as queries:
+            found = set(queryset.values_list('id', flat=True))
+        assert found == {titles[0].id, titles[1].id}
+        assert '"reviews_title"."search_vector"' not in queries[0]['sql'], (
+            'Проверьте, что подзапрос поиска в админке обращается к своей '
+            'таблице (U0) и может использовать GIN-индекс'
+        )
+
+
+class TestSearchFacets:
+
+    def test_facets_with_search(self, api_client, titles):
+        response = api_client.get(
+            '/api/v1/titles/', {'search': 'океан', 'facets': 1}
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что счетчики считаются по результатам поиска'
+        )
+        assert response.json()['facets']['category'] == [
+            {'slug': 'movie', 'name': 'Фильм', 'count': 2}
+        ]
@@ -0,0 +1,117 @@
+import pytest
+
+from api.throttling import SlidingWindowThrottle
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    rates = {
+        'signup_ip': '5/hour',
+        'signup_username': '2/hour',
+        'signup_email': '2/hour',
+        'token_ip': '5/hour',
+        'token_username_ip': '2/hour',
+    }
+    monkeypatch.setattr(SlidingWindowThrottle, 'THROTTLE_RATES', rates)
+    return rates
+
+
+def signup(client, number, **extra):
+    return client.post(SIGNUP_URL, {
+        'username': f'user{number}', 'email': f'user{number}@yamdb.fake'
+    }, **extra)
+
+
+@pytest.mark.django_db
+class TestAuthThrottling:
+
+    def test_signup_limited_by_ip(self, api_client, rates,
+                                  django_assert_num_queries):
+        for number in range(5):
+            assert signup(api_client, number).status_code == 200
+        with django_assert_num_queries(0):
+            response = signup(api_client, 5)
+        assert response.status_code == 429, (
+            'Проверьте, что регистрация ограничена по IP и лишний запрос '
+            'отклоняется без обращений к БД'
+        )
+        assert int(response['Retry-After']) > 0
+        response = signup(api_client, 5, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == 200, (
+            'Проверьте, что лимит по IP не затрагивает других клиентов'
+        )
+
+    def test_signup_limited_by_email_and_username(self, api_client, rates):
+        for number in range(2):
+            assert signup(
+                api_client, 1, REMOTE_ADDR=f'10.0.1.{number}'
+            ).status_code == 200
+        response = api_client.post(SIGNUP_URL, {
+            'username': 'other', 'email': 'USER1@yamdb.fake'
+        }, REMOTE_ADDR='10.0.1.9')
+        assert response.status_code == 429, (
+            'Проверьте, что регистрация ограничена по email без учета '
+            'регистра с любого IP'
+        )
+
+    def test_token_limited_by_username_and_ip(self, api_client, rates,
+                                              django_user_model,
+                                              django_assert_num_queries):
+        django_user_model.objects.create(
+            username='victim', email='victim@yamdb.fake'
+        )
+        data = {'username': 'victim', 'confirmation_code': '0000000000'}
+        for _ in range(2):
+            response = api_client.post(
+                TOKEN_URL, data, REMOTE_ADDR='10.0.2.1'
+            )
+            assert response.status_code == 400
+        with django_assert_num_queries(0):
+            response = api_client.post(
+                TOKEN_URL, data, REMOTE_ADDR='10.0.2.1'
+            )
+        assert response.status_code == 429, (
+            'Проверьте, что подбор кода одного пользователя с одного IP '
+            'ограничен'
+        )
+        response = api_client.post(TOKEN_URL, data, REMOTE_ADDR='10.0.2.9')
+        assert response.status_code == 400, (
+            'Проверьте, что лимит по имени с чужого IP не блокирует вход '
+            'самому пользователю'
+        )
+
+
+    @pytest.mark.parametrize('url', [SIGNUP_URL, TOKEN_URL])
+    def test_list_body_is_rejected(self, api_client, rates, url):
+        response = api_client.post(url, [], format='json')
+        assert response.status_code == 400, (
+            'Проверьте, что тело-список отклоняется с кодом 400'
+        )
+
+
+class TestSlidingWindow:
+
+    def test_previous_window_is_weighted(self, rates, monkeypatch):
+        from rest_framework.test import APIRequestFactory
+
+        from api.throttling import IPRateThrottle
+
+        class View:
+            throttle_scope = 'signup'
+
+        request = APIRequestFactory().post(SIGNUP_URL)
+        now = 2 * 3600
+        monkeypatch.setattr(IPRateThrottle, 'timer', lambda _: now)
+        for _ in range(5):
+            assert IPRateThrottle().allow_request(request, View())
+        # Середина следующего окна: 5 прошлых запросов весят 2.5.
+        now = 3.5 * 3600
+        results = [
+            IPRateThrottle().allow_request(request, View()) for _ in range(3)
+        ]
+        assert results == [True, True, False], (
+            'Проверьте, что учитывается доля запросов предыдущего окна'
+        )
@@ -0,0 +1,30 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from reviews.validators import validate_username_allowed_chars
+
+
+class TestUsernameValidator:
+
+    @pytest.mark.parametrize('username', [
+        'reader', 'user.name@mail+tag-1', 'Пользователь_2'
+    ])
+    def test_allowed(self, username):
+        assert validate_username_allowed_chars(username) == username
+
+    def test_invalid_chars_listed_once_in_order(self):
+        with pytest.raises(ValidationError) as error:
+            validate_username_allowed_chars('a b!c d#!')
+        assert error.value.messages == [
+            "Нельзя использовать символы ' !#' в username"
+        ], 'Проверьте, что каждый недопустимый символ указан один раз'
+
+    @pytest.mark.django_db
+    def test_signup_with_valid_username(self, api_client):
+        response = api_client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'new.user', 'email': 'new@yamdb.fake'}
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что регистрация с допустимым username проходит'
+        )
@@ -0,0 +1,78 @@
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalogue(make_catalogue, django_user_model):
+    from reviews.models import Review, Title
+    titles, reviews = make_catalogue(5)
+    Title.objects.create(name='Без категории', year=1999, description='')
+    author = django_user_model.objects.create(
+        username='critic', email='critic@yamdb.fake'
+    )
+    Review.objects.create(
+        title=titles[0], author=author, text='Так себе', score=2
+    )
+    return titles, reviews
+
+
+def get_urls(titles, reviews):
+    title, review = titles[0], reviews[0]
+    return [
+        '/api/v1/titles/',
+        '/api/v1/titles/?genre=drama&year=2000',
+        '/api/v1/titles/?pagination=cursor',
+        f'/api/v1/titles/{title.id}/',
+        f'/api/v1/titles/{title.id}/reviews/',
+        f'/api/v1/titles/{title.id}/reviews/?pagination=cursor',
+        f'/api/v1/titles/{title.id}/reviews/{review.id}/',
+        f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        (
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            f'{review.comments.first().id}/'
+        ),
+    ]
+
+
+class TestValuesSerializers:
+
+    def test_output_identical(self, api_client, settings, catalogue):
+        from django.core.cache import cache
+        urls = get_urls(*catalogue)
+        expected = [api_client.get(url).content for url in urls]
+        settings.API_VALUES_SERIALIZERS = True
+        cache.clear()
+        for url, content in zip(urls, expected):
+            assert api_client.get(url).content == content, (
+                f'Проверьте, что ответ {url} совпадает с обычным '
+                'сериализатором'
+            )
+
+    def test_title_genres_fetched_once(self, api_client, settings, catalogue,
+                                       django_assert_num_queries):
+        settings.API_VALUES_SERIALIZERS = True
+        with django_assert_num_queries(3):
+            api_client.get('/api/v1/titles/')
+
+    def test_search_with_cursor(self, api_client, settings, category):
+        from django.core.cache import cache
+        from reviews.models import Title
+
+        for index in range(15):
+            Title.objects.create(
+                name=f'Океан {index}', year=2000, category=category,
+                description='Океан' * (index % 3)
+            )
+        url = '/api/v1/titles/?search=океан&pagination=cursor'
+        first = api_client.get(url).json()
+        expected = [first, api_client.get(first['next']).json()]
+        settings.API_VALUES_SERIALIZERS = True
+        cache.clear()
+        response = api_client.get(url)
+        assert response.status_code == 200
+        first = response.json()
+        assert [first, api_client.get(first['next']).json()] == expected, (
+            'Проверьте курсорную пагинацию результатов поиска с '
+            'API_VALUES_SERIALIZERS'
+        )